@@ -6,9 +6,8 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
 from typing import Optional, Dict, Any, List
+import html
 import logging
 from datetime import datetime, timezone, timedelta
 import os
@@ -106,9 +105,10 @@ from modules.visualizer import (
 )
 from utils.currency_mapper import get_currency_mapping, get_market_info
 from utils.helpers import (
-    format_currency, format_percentage, display_error_message,
-    display_success_message, display_warning_message, show_loading_spinner,
-    calculate_returns
+    format_currency, format_percentage, format_currency_array,
+    format_percentage_array, calculate_return_statistics, lttb_downsample_indices,
+    display_error_message,
+    display_success_message, display_warning_message, show_loading_spinner
 )
 from modules.factor_analysis import (
     get_fama_french_factors, calculate_portfolio_returns_robust, perform_factor_regression,
@@ -119,6 +119,21 @@ from modules.factor_analysis import (
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# リスク時間軸の変換係数（月次: √20営業日、年次: √252営業日）
+# 再実行ごとにネスト関数を作り直さないようモジュールレベルで保持
+_TIME_SCALE_FACTORS = {
+    "日次": (1.0, "日"),
+    "月次": (np.sqrt(20), "月"),
+    "年次": (np.sqrt(252), "年")
+}
+
+# ウェルカムページのサンプルCSV（固定内容のためrerunごとに再生成しない）
+_SAMPLE_PORTFOLIO_CSV = pd.DataFrame({
+    'Ticker': ['AAPL', 'MSFT', '7203.T', 'ASML', 'TSLA'],
+    'Shares': [100, 50, 1000, 20, 30],
+    'AvgCostJPY': [15000, 25000, 800, 60000, 20000]
+}).to_csv(index=False)
+
 
 def main_dashboard():
     """メインダッシュボード"""
@@ -219,11 +234,11 @@ def main_dashboard():
                         selected_file = f.read()
                     st.success(f"ファイル '{selected_file_name}' が選択されました！")
                     
-                    # プレビュー表示
+                    # プレビュー表示（先頭5行だけ読み込み、全行のパースを避ける）
                     try:
-                        preview_df = pd.read_csv(selected_file_path)
+                        preview_df = pd.read_csv(selected_file_path, nrows=5)
                         st.write("**データプレビュー:**")
-                        st.dataframe(preview_df.head(), use_container_width=True)
+                        st.dataframe(preview_df, use_container_width=True)
                     except:
                         pass
                 except Exception as e:
@@ -245,12 +260,12 @@ def main_dashboard():
                 st.session_state.uploaded_data = uploaded_file.getvalue()
                 st.session_state.portfolio_df = None  # データが変更されたらリセット
             
-            # 簡易プレビュー
+            # 簡易プレビュー（先頭5行だけ読み込み、全行のパースを避ける）
             try:
-                preview_df = pd.read_csv(uploaded_file)
+                preview_df = pd.read_csv(uploaded_file, nrows=5)
                 uploaded_file.seek(0)  # ファイルポインタをリセット
                 st.write("**データプレビュー:**")
-                st.dataframe(preview_df.head(), use_container_width=True)
+                st.dataframe(preview_df, use_container_width=True)
             except:
                 pass
         
@@ -311,6 +326,33 @@ def validate_and_load_portfolio_data(uploaded_file) -> Optional[pd.DataFrame]:
         return None
 
 
+@st.cache_data(show_spinner=False)
+def _to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """ダウンロード用CSVを生成（同じDataFrameなら再実行間でキャッシュ）"""
+    return df.to_csv(index=False).encode('utf-8-sig')
+
+
+def get_shared_ticker_complete_info(data_adapter, tickers: list) -> dict:
+    """
+    企業情報をセッション単位で共有取得
+
+    配分分析・バリュエーション・詳細データの各タブが同じ企業情報を
+    個別に取得し直さないよう、銘柄リストをキーにセッションステートで共有する。
+
+    Args:
+        data_adapter: データアダプター
+        tickers: ティッカーリスト
+
+    Returns:
+        dict: ティッカーをキーとする企業情報辞書
+    """
+    tickers_key = tuple(sorted(tickers))
+    if st.session_state.get('ticker_info_key') != tickers_key:
+        st.session_state.ticker_complete_info = data_adapter.get_multiple_ticker_complete_info(tickers)
+        st.session_state.ticker_info_key = tickers_key
+    return st.session_state.ticker_complete_info
+
+
 def display_portfolio_dashboard(portfolio_df: pd.DataFrame):
     """ポートフォリオダッシュボードの表示"""
     
@@ -319,7 +361,7 @@ def display_portfolio_dashboard(portfolio_df: pd.DataFrame):
         display_data_summary(portfolio_df)
         
         # セッションステートでデータバンドルをチェック
-        tickers = portfolio_df['Ticker'].tolist()
+        tickers = portfolio_df['Ticker'].astype(str).tolist()
         tickers_key = tuple(sorted(tickers))
         
         if ('data_bundle' not in st.session_state or 
@@ -369,17 +411,31 @@ def display_portfolio_dashboard(portfolio_df: pd.DataFrame):
         exchange_rates = data_adapter.get_exchange_rates()
         currency_mapping = data_adapter.get_currency_mapping()
         
-        # 損益計算
-        pnl_df = calculate_portfolio_pnl(
-            portfolio_df, current_prices, exchange_rates, currency_mapping
+        # 損益計算（入力が変わらない限りセッションステートの結果を再利用し、
+        # タブ切り替え等の再実行でpandas処理を走らせない）
+        pnl_fingerprint = (
+            tickers_key,
+            tuple(portfolio_df[['Ticker', 'Shares', 'AvgCostJPY']].itertuples(index=False, name=None)),
+            tuple(sorted((t, round(p, 6)) for t, p in current_prices.items())),
+            tuple(sorted((c, round(r, 6)) for c, r in exchange_rates.items())),
+            tuple(sorted(currency_mapping.items()))
         )
-        
-        if pnl_df.empty:
-            display_warning_message("損益計算ができませんでした。しばらく後に再試行してください。")
-            return
-        
-        # ポートフォリオサマリーを計算
-        portfolio_summary = calculate_portfolio_summary(pnl_df)
+
+        if st.session_state.get('pnl_fingerprint') != pnl_fingerprint:
+            pnl_df = calculate_portfolio_pnl(
+                portfolio_df, current_prices, exchange_rates, currency_mapping
+            )
+
+            if pnl_df.empty:
+                display_warning_message("損益計算ができませんでした。しばらく後に再試行してください。")
+                return
+
+            st.session_state.pnl_df = pnl_df
+            st.session_state.portfolio_summary = calculate_portfolio_summary(pnl_df)
+            st.session_state.pnl_fingerprint = pnl_fingerprint
+
+        pnl_df = st.session_state.pnl_df
+        portfolio_summary = st.session_state.portfolio_summary
         
         # 基本メトリクス表示
         display_portfolio_metrics(portfolio_summary)
@@ -427,42 +483,62 @@ def display_portfolio_dashboard(portfolio_df: pd.DataFrame):
         display_error_message(e, "ダッシュボード表示中にエラーが発生しました")
 
 
+def _metric_html(label: str, value: str, delta: str = "") -> str:
+    """st.metric相当のメトリクス1つ分のHTMLを生成"""
+    # ティッカー等のユーザー入力由来の文字列をそのままHTMLに埋め込まない
+    label = html.escape(str(label))
+    value = html.escape(str(value))
+    delta_html = (
+        f'<div style="font-size:0.8rem;color:#808495;">{html.escape(str(delta))}</div>'
+        if delta else ''
+    )
+    return (
+        '<div style="flex:1;min-width:0;">'
+        f'<div style="font-size:0.85rem;color:#808495;">{label}</div>'
+        f'<div style="font-size:1.6rem;font-weight:600;">{value}</div>'
+        f'{delta_html}'
+        '</div>'
+    )
+
+
+def render_metric_row(metrics: List[tuple]):
+    """
+    複数メトリクスを1つのHTMLブロックでまとめて描画
+
+    st.columns + st.metric はメトリクスごとにStreamlitメッセージを送るため、
+    1行分をflexレイアウトのHTMLに束ねて st.markdown 1回で描画する。
+
+    Args:
+        metrics: (label, value, delta) タプルのリスト
+    """
+    html = ('<div style="display:flex;gap:1rem;">'
+            + ''.join(_metric_html(*m) for m in metrics)
+            + '</div>')
+    st.markdown(html, unsafe_allow_html=True)
+
+
 def display_portfolio_metrics(summary: Dict[str, float]):
     """ポートフォリオメトリクスの表示"""
     if not summary:
         return
-    
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.metric(
-            label="総評価額",
-            value=format_currency(summary.get('total_current_value_jpy', 0)),
-            delta=format_currency(summary.get('total_pnl_amount_jpy', 0))
-        )
-    
-    with col2:
-        st.metric(
-            label="総損益率",
-            value=format_percentage(summary.get('overall_pnl_percentage', 0)),
-            delta=f"{summary.get('profitable_positions', 0)}勝/{summary.get('losing_positions', 0)}敗"
-        )
-    
-    with col3:
-        st.metric(
-            label="勝率",
-            value=format_percentage(summary.get('win_rate', 0)),
-            delta=f"平均ポジション: {format_currency(summary.get('average_position_size', 0))}"
-        )
-    
-    with col4:
-        best_ticker = summary.get('max_gain_ticker', '')
-        worst_ticker = summary.get('max_loss_ticker', '')
-        st.metric(
-            label="最高/最低パフォーマンス",
-            value=f"{best_ticker}: {format_percentage(summary.get('max_gain_percentage', 0))}",
-            delta=f"{worst_ticker}: {format_percentage(summary.get('max_loss_percentage', 0))}"
-        )
+
+    best_ticker = summary.get('max_gain_ticker', '')
+    worst_ticker = summary.get('max_loss_ticker', '')
+
+    render_metric_row([
+        ("総評価額",
+         format_currency(summary.get('total_current_value_jpy', 0)),
+         format_currency(summary.get('total_pnl_amount_jpy', 0))),
+        ("総損益率",
+         format_percentage(summary.get('overall_pnl_percentage', 0)),
+         f"{summary.get('profitable_positions', 0)}勝/{summary.get('losing_positions', 0)}敗"),
+        ("勝率",
+         format_percentage(summary.get('win_rate', 0)),
+         f"平均ポジション: {format_currency(summary.get('average_position_size', 0))}"),
+        ("最高/最低パフォーマンス",
+         f"{best_ticker}: {format_percentage(summary.get('max_gain_percentage', 0))}",
+         f"{worst_ticker}: {format_percentage(summary.get('max_loss_percentage', 0))}")
+    ])
 
 
 def display_performance_analysis(pnl_df: pd.DataFrame, summary: Dict[str, float]):
@@ -521,17 +597,8 @@ def display_risk_analysis(pnl_df: pd.DataFrame, tickers: list, portfolio_df: pd.
         )
         st.session_state.risk_time_scale = time_scale
     
-    # 時間スケール変換係数を事前に計算
-    def get_time_scale_factor(scale):
-        if scale == "日次":
-            return 1, "日"
-        elif scale == "月次":
-            return np.sqrt(20), "月"  # 20営業日
-        elif scale == "年次":
-            return np.sqrt(252), "年"  # 252営業日
-        return 1, "日"
-    
-    scale_factor, scale_label = get_time_scale_factor(time_scale)
+    # 時間スケール変換係数（モジュールレベルの定数テーブルから取得）
+    scale_factor, scale_label = _TIME_SCALE_FACTORS.get(time_scale, (1.0, "日"))
     
     try:
         # データアダプターからキャッシュされた過去データを取得
@@ -579,42 +646,43 @@ def display_risk_analysis(pnl_df: pd.DataFrame, tickers: list, portfolio_df: pd.
             if len(historical_data) < 20:
                 st.warning(f"データ期間が短すぎます（{len(historical_data)}日）。より長い期間を選択することをお勧めします。")
             
-            # 日次リターンを計算
-            returns_df = pd.DataFrame()
-            for ticker in tickers:
-                if ticker in historical_data.columns:
-                    returns = calculate_returns(historical_data[ticker])
-                    if not returns.empty:
-                        returns_df[ticker] = returns
-            
+            # 日次リターンを一括計算（銘柄ごとのループを避けてフレーム全体でpct_change）
+            returns_df = historical_data.pct_change().dropna(how='all')
+            returns_df = returns_df.dropna(axis=1, how='all')
+
             if returns_df.empty:
                 st.error("リターンデータの計算に失敗しました。")
                 return
             
             st.info(f"📊 分析期間: {analysis_period} ({len(returns_df)}営業日のデータ)")
             
-            # ポートフォリオ重みを計算
-            total_value = pnl_df['current_value_jpy'].sum()
-            weights = (pnl_df['current_value_jpy'] / total_value).values
-            
+            # ポートフォリオ重みを計算（Series演算や中間フレームを作らずndarrayで直接計算）
+            position_values = pnl_df['current_value_jpy'].to_numpy()
+
             # データが揃っている銘柄のみでウェイトを再計算
-            valid_tickers = [ticker for ticker in tickers if ticker in returns_df.columns]
-            valid_pnl = pnl_df[pnl_df['ticker'].isin(valid_tickers)]
-            
+            # （列集合を1度だけハッシュ化し、元の銘柄順を保ったまま判定）
+            returns_columns = set(returns_df.columns)
+            valid_tickers = [ticker for ticker in tickers if ticker in returns_columns]
+
             if len(valid_tickers) != len(tickers):
-                missing_tickers = set(tickers) - set(valid_tickers)
+                missing_tickers = [ticker for ticker in tickers if ticker not in returns_columns]
                 st.warning(f"以下の銘柄のデータが不足しているため、分析から除外されます: {', '.join(missing_tickers)}")
-            
+
             if len(valid_tickers) < 2:
                 st.error("相関分析には少なくとも2銘柄のデータが必要です。")
                 return
-            
+
             # 有効な銘柄のウェイトを再計算
-            valid_total_value = valid_pnl['current_value_jpy'].sum()
-            valid_weights = (valid_pnl['current_value_jpy'] / valid_total_value).values
-            
+            valid_mask = pnl_df['ticker'].isin(valid_tickers).to_numpy()
+            valid_values = position_values[valid_mask]
+            valid_weights = (valid_values / valid_values.sum()).astype(np.float32)
+
+            # リスク計算はfloat32で十分な精度（日次リターンは~1e-2のオーダー）。
+            # メモリ帯域を半減させ、共分散・行列積のスループットを上げる
+            returns_valid = returns_df[valid_tickers].astype(np.float32)
+
             # リスク指標計算
-            risk_metrics = calculate_portfolio_risk(returns_df[valid_tickers], valid_weights)
+            risk_metrics = calculate_portfolio_risk(returns_valid, valid_weights)
             
             if risk_metrics:
                 col1, col2 = st.columns(2)
@@ -629,12 +697,17 @@ def display_risk_analysis(pnl_df: pd.DataFrame, tickers: list, portfolio_df: pd.
                     st.metric("分散効果", 
                              f"{risk_metrics.get('diversification_ratio', 1):.2f}x")
                     
-                    # 個別銘柄ボラティリティの表示
+                    # 個別銘柄ボラティリティの表示（銘柄ごとのst.writeではなく1回の描画）
                     with st.expander(f"個別銘柄ボラティリティ（{scale_label}次）"):
                         individual_vols = risk_metrics.get('individual_volatilities', pd.Series())
-                        for ticker, vol in individual_vols.items():
-                            vol_scaled = vol * scale_factor
-                            st.write(f"**{ticker}**: {format_percentage(vol_scaled * 100)}")
+                        if not individual_vols.empty:
+                            vol_df = pd.DataFrame({
+                                'ティッカー': individual_vols.index,
+                                f'ボラティリティ（{scale_label}次）': format_percentage_array(
+                                    individual_vols.to_numpy() * scale_factor * 100
+                                )
+                            })
+                            st.dataframe(vol_df, use_container_width=True, hide_index=True)
                 
                 with col2:
                     # 相関ヒートマップ
@@ -642,62 +715,61 @@ def display_risk_analysis(pnl_df: pd.DataFrame, tickers: list, portfolio_df: pd.
                         corr_chart = create_correlation_heatmap(risk_metrics['correlation_matrix'])
                         st.plotly_chart(corr_chart, use_container_width=True)
             
-            # ポートフォリオリターンを計算
-            portfolio_returns = (returns_df[valid_tickers] * valid_weights).sum(axis=1)
+            # ポートフォリオリターンを計算（要素積+行和ではなくBLASの行列積で一括計算）
+            returns_arr = np.nan_to_num(returns_valid.to_numpy(copy=False))
+            portfolio_returns = pd.Series(returns_arr @ valid_weights, index=returns_df.index)
             
             # VaR/CVaR計算
-            var_metrics = calculate_var_cvar(pd.Series(portfolio_returns))
+            var_metrics = calculate_var_cvar(portfolio_returns)
             
             if var_metrics:
                 st.subheader(f"📉 VaR/CVaR分析（{scale_label}次）")
-                col1, col2, col3, col4 = st.columns(4)
-                
-                with col1:
-                    var_95_scaled = var_metrics.get('VaR_95', 0) * scale_factor
-                    st.metric(f"VaR (95%)", format_percentage(var_95_scaled * 100))
-                
-                with col2:
-                    cvar_95_scaled = var_metrics.get('CVaR_95', 0) * scale_factor
-                    st.metric(f"CVaR (95%)", format_percentage(cvar_95_scaled * 100))
-                
-                with col3:
-                    var_99_scaled = var_metrics.get('VaR_99', 0) * scale_factor
-                    st.metric(f"VaR (99%)", format_percentage(var_99_scaled * 100))
-                
-                with col4:
-                    daily_vol = portfolio_returns.std()
-                    scaled_vol = daily_vol * scale_factor
-                    st.metric(f"{scale_label}率ボラティリティ", format_percentage(scaled_vol * 100))
+                var_95_scaled = var_metrics.get('VaR_95', 0) * scale_factor
+                cvar_95_scaled = var_metrics.get('CVaR_95', 0) * scale_factor
+                var_99_scaled = var_metrics.get('VaR_99', 0) * scale_factor
+                scaled_vol = portfolio_returns.std() * scale_factor
+
+                render_metric_row([
+                    ("VaR (95%)", format_percentage(var_95_scaled * 100)),
+                    ("CVaR (95%)", format_percentage(cvar_95_scaled * 100)),
+                    ("VaR (99%)", format_percentage(var_99_scaled * 100)),
+                    (f"{scale_label}率ボラティリティ", format_percentage(scaled_vol * 100))
+                ])
                 
                 # VaR分布チャート（時間軸に応じてスケール）
-                var_chart = create_var_distribution(pd.Series(portfolio_returns), var_metrics, scale_factor, scale_label)
+                var_chart = create_var_distribution(portfolio_returns, var_metrics, scale_factor, scale_label)
                 st.plotly_chart(var_chart, use_container_width=True)
                 
                 # ストレステスト
                 st.subheader("🚨 ストレステスト")
-                stress_results = stress_test_scenario(returns_df[valid_tickers], valid_weights, 
+                stress_results = stress_test_scenario(returns_valid, valid_weights,
                                                      stress_factor=1.5, correlation_shock=0.8)
                 
                 if stress_results:
+                    # スケール変換をメトリクスごとに繰り返さず、まとめて1回で計算
+                    normal_vol = stress_results.get('normal_portfolio_vol', 0)
+                    stressed_vol = stress_results.get('stressed_portfolio_vol', 0)
+                    stress_multiplier = stress_results.get('stress_multiplier', 1)
+                    scaled = {
+                        'normal_vol': normal_vol * scale_factor,
+                        'stressed_vol': stressed_vol * scale_factor
+                    }
+                    # ストレス時の想定損失（95%信頼区間、約2標準偏差）
+                    stressed_vol_scaled = scaled['stressed_vol']
+                    stress_loss_95 = -stressed_vol_scaled * 1.96  # 負の値として表示
+
                     col1, col2, col3, col4 = st.columns(4)
-                    
+
                     with col1:
-                        normal_vol = stress_results.get('normal_portfolio_vol', 0)
-                        normal_vol_scaled = normal_vol * scale_factor
-                        st.metric(f"通常時ボラティリティ（{scale_label}次）", format_percentage(normal_vol_scaled * 100))
-                    
+                        st.metric(f"通常時ボラティリティ（{scale_label}次）", format_percentage(scaled['normal_vol'] * 100))
+
                     with col2:
-                        stressed_vol = stress_results.get('stressed_portfolio_vol', 0)
-                        stressed_vol_scaled = stressed_vol * scale_factor
-                        st.metric(f"ストレス時ボラティリティ（{scale_label}次）", format_percentage(stressed_vol_scaled * 100))
-                    
+                        st.metric(f"ストレス時ボラティリティ（{scale_label}次）", format_percentage(scaled['stressed_vol'] * 100))
+
                     with col3:
-                        stress_multiplier = stress_results.get('stress_multiplier', 1)
                         st.metric("ストレス倍率", f"{stress_multiplier:.2f}x")
-                    
+
                     with col4:
-                        # ストレス時の想定損失（95%信頼区間、約2標準偏差）
-                        stress_loss_95 = -stressed_vol_scaled * 1.96  # 負の値として表示
                         st.metric(f"想定最大損失 95%（{scale_label}次）", format_percentage(stress_loss_95 * 100))
                     
                     # ストレステスト詳細
@@ -1004,50 +1076,51 @@ def display_risk_analysis(pnl_df: pd.DataFrame, tickers: list, portfolio_df: pd.
                 
                 # 統計情報の詳細表示
                 with st.expander(f"📈 詳細統計（{scale_label}次ベース）"):
+                    # 平均・最大・最小・標準偏差・歪度・尖度をまとめて1回で算出
+                    # （pandasのリダクションを個別に呼ぶと系列を6回走査する）
+                    return_stats = calculate_return_statistics(portfolio_returns)
+                    avg_return = return_stats.get('mean', 0.0)
+                    max_return = return_stats.get('max', 0.0)
+                    min_return = return_stats.get('min', 0.0)
+
                     stats_col1, stats_col2 = st.columns(2)
-                    
+
                     with stats_col1:
                         st.write(f"**リターン統計（{scale_label}次）:**")
-                        
+
                         # 時間軸に応じた統計表示
                         if time_scale == "日次":
-                            avg_return_scaled = portfolio_returns.mean()
-                            max_return_scaled = portfolio_returns.max()
-                            min_return_scaled = portfolio_returns.min()
-                            st.write(f"平均日次リターン: {format_percentage(avg_return_scaled * 100)}")
-                            st.write(f"最大日次リターン: {format_percentage(max_return_scaled * 100)}")
-                            st.write(f"最小日次リターン: {format_percentage(min_return_scaled * 100)}")
-                            st.write(f"年率リターン（参考）: {format_percentage(avg_return_scaled * 252 * 100)}")
-                        
+                            st.write(f"平均日次リターン: {format_percentage(avg_return * 100)}")
+                            st.write(f"最大日次リターン: {format_percentage(max_return * 100)}")
+                            st.write(f"最小日次リターン: {format_percentage(min_return * 100)}")
+                            st.write(f"年率リターン（参考）: {format_percentage(avg_return * 252 * 100)}")
+
                         elif time_scale == "月次":
-                            avg_return_scaled = portfolio_returns.mean() * 20  # 20営業日
-                            max_return_scaled = portfolio_returns.max() * np.sqrt(20)
-                            min_return_scaled = portfolio_returns.min() * np.sqrt(20)
+                            avg_return_scaled = avg_return * 20  # 20営業日
+                            max_return_scaled = max_return * np.sqrt(20)
+                            min_return_scaled = min_return * np.sqrt(20)
                             st.write(f"平均月次リターン: {format_percentage(avg_return_scaled * 100)}")
                             st.write(f"想定最大月次リターン: {format_percentage(max_return_scaled * 100)}")
                             st.write(f"想定最小月次リターン: {format_percentage(min_return_scaled * 100)}")
                             st.write(f"年率リターン（参考）: {format_percentage(avg_return_scaled * 12 * 100)}")
-                        
+
                         elif time_scale == "年次":
-                            avg_return_scaled = portfolio_returns.mean() * 252  # 252営業日
-                            max_return_scaled = portfolio_returns.max() * np.sqrt(252)
-                            min_return_scaled = portfolio_returns.min() * np.sqrt(252)
+                            avg_return_scaled = avg_return * 252  # 252営業日
+                            max_return_scaled = max_return * np.sqrt(252)
+                            min_return_scaled = min_return * np.sqrt(252)
                             st.write(f"平均年次リターン: {format_percentage(avg_return_scaled * 100)}")
                             st.write(f"想定最大年次リターン: {format_percentage(max_return_scaled * 100)}")
                             st.write(f"想定最小年次リターン: {format_percentage(min_return_scaled * 100)}")
-                    
+
                     with stats_col2:
                         st.write("**リスク統計:**")
-                        skewness = portfolio_returns.skew()
-                        kurtosis = portfolio_returns.kurtosis()
-                        daily_vol = portfolio_returns.std()
-                        scaled_vol = daily_vol * scale_factor
-                        
-                        st.write(f"歪度: {skewness:.3f}")
-                        st.write(f"尖度: {kurtosis:.3f}")
+                        scaled_vol = return_stats.get('std', 0.0) * scale_factor
+
+                        st.write(f"歪度: {return_stats.get('skewness', 0.0):.3f}")
+                        st.write(f"尖度: {return_stats.get('kurtosis', 0.0):.3f}")
                         st.write(f"{scale_label}次ボラティリティ: {format_percentage(scaled_vol * 100)}")
                         st.write(f"データ期間: {len(portfolio_returns)}営業日")
-                        st.write(f"欠損データ: {portfolio_returns.isna().sum()}日")
+                        st.write(f"欠損データ: {return_stats.get('missing', 0)}日")
     
     except Exception as e:
         display_error_message(e, "リスク分析中にエラーが発生しました")
@@ -1065,8 +1138,8 @@ def display_allocation_analysis(pnl_df: pd.DataFrame, tickers: List[str]):
             return
         
         with show_loading_spinner("企業情報を処理中..."):
-            # キャッシュされた完全な企業情報を取得
-            ticker_complete_info = data_adapter.get_multiple_ticker_complete_info(tickers)
+            # セッション共有の企業情報を取得（タブ間で再取得しない）
+            ticker_complete_info = get_shared_ticker_complete_info(data_adapter, tickers)
             
             # 配分分析用に基本情報のみを抽出
             ticker_info = {}
@@ -1149,12 +1222,12 @@ def display_allocation_analysis(pnl_df: pd.DataFrame, tickers: List[str]):
             }
             display_df = display_df.rename(columns=column_mapping)
             
-            # 数値フォーマット
-            display_df['現在価値（円）'] = display_df['現在価値（円）'].apply(lambda x: format_currency(x))
-            display_df['取得原価（円）'] = display_df['取得原価（円）'].apply(lambda x: format_currency(x))
-            display_df['損益金額（円）'] = display_df['損益金額（円）'].apply(lambda x: format_currency(x))
-            display_df['配分比率（%）'] = display_df['配分比率（%）'].apply(lambda x: format_percentage(x))
-            display_df['損益率（%）'] = display_df['損益率（%）'].apply(lambda x: format_percentage(x))
+            # 数値フォーマット（applyではなくndarray経由で一括変換）
+            display_df['現在価値（円）'] = format_currency_array(display_df['現在価値（円）'])
+            display_df['取得原価（円）'] = format_currency_array(display_df['取得原価（円）'])
+            display_df['損益金額（円）'] = format_currency_array(display_df['損益金額（円）'])
+            display_df['配分比率（%）'] = format_percentage_array(display_df['配分比率（%）'])
+            display_df['損益率（%）'] = format_percentage_array(display_df['損益率（%）'])
             
             st.dataframe(display_df, use_container_width=True)
             
@@ -1207,8 +1280,8 @@ def display_valuation_analysis(pnl_df: pd.DataFrame, tickers: List[str]):
         
         with show_loading_spinner("バリュエーション情報を処理中..."):
             try:
-                # キャッシュされた完全な企業情報を取得
-                ticker_complete_info = data_adapter.get_multiple_ticker_complete_info(tickers)
+                # セッション共有の企業情報を取得（タブ間で再取得しない）
+                ticker_complete_info = get_shared_ticker_complete_info(data_adapter, tickers)
                 
                 # データ取得結果の検証
                 if not ticker_complete_info:
@@ -1391,8 +1464,8 @@ def display_detailed_data(pnl_df: pd.DataFrame, original_df: pd.DataFrame, ticke
             return
         
         with show_loading_spinner("詳細データを処理中..."):
-            # キャッシュされた完全な企業情報を取得
-            ticker_complete_info = data_adapter.get_multiple_ticker_complete_info(tickers)
+            # セッション共有の企業情報を取得（タブ間で再取得しない）
+            ticker_complete_info = get_shared_ticker_complete_info(data_adapter, tickers)
             
             # データ取得結果の検証
             if not ticker_complete_info:
@@ -1424,15 +1497,19 @@ def display_detailed_data(pnl_df: pd.DataFrame, original_df: pd.DataFrame, ticke
         
         # 本社所在国、地域、セクター情報を追加
         from modules.country_fetcher import classify_region_by_country
-        
+
+        # 地域分類は国ごとに1回だけ実行し、同じ国の銘柄で再分類しない
+        unique_countries = {info.get('country') for info in ticker_complete_info.values() if info}
+        country_to_region = {c: classify_region_by_country(c) for c in unique_countries | {None}}
+
         def get_company_info(ticker):
             info = ticker_complete_info.get(ticker, {})
             if not info:
                 info = {}
-            
+
             country = info.get('country')
             sector = info.get('sector')
-            region = classify_region_by_country(country)
+            region = country_to_region.get(country) or classify_region_by_country(country)
             
             # セクターの処理：取得失敗時は「その他」とする
             if not sector or (isinstance(sector, str) and sector.strip() == ""):
@@ -1497,41 +1574,50 @@ def display_detailed_data(pnl_df: pd.DataFrame, original_df: pd.DataFrame, ticke
                 valuation_data
             )
         
-        # 企業情報カラムを追加
-        company_data = [get_company_info(ticker) for ticker in display_pnl_df['ticker']]
-        display_pnl_df['企業名'] = [company_names.get(ticker, ticker) for ticker in display_pnl_df['ticker']]
-        display_pnl_df['本社所在国'] = [data[0] for data in company_data]
-        display_pnl_df['地域'] = [data[1] for data in company_data]
-        display_pnl_df['セクター'] = [data[2] for data in company_data]
-        
+        # 企業情報カラムを追加（company_dataの走査はzipで1回にまとめる）
+        row_tickers = display_pnl_df['ticker'].tolist()
+        company_data = [get_company_info(ticker) for ticker in row_tickers]
+        countries, regions, sectors, valuations = (
+            map(list, zip(*company_data)) if company_data else ([], [], [], [])
+        )
+        display_pnl_df['企業名'] = [company_names.get(ticker, ticker) for ticker in row_tickers]
+        display_pnl_df['本社所在国'] = countries
+        display_pnl_df['地域'] = regions
+        display_pnl_df['セクター'] = sectors
+
         # バリュエーション指標を追加
-        display_pnl_df['予想PER'] = [data[3]['forwardPE'] for data in company_data]
-        display_pnl_df['PBR'] = [data[3]['priceToBook'] for data in company_data]
-        display_pnl_df['PSR'] = [data[3]['priceToSalesTrailing12Months'] for data in company_data]
-        display_pnl_df['EV/EBITDA'] = [data[3]['enterpriseToEbitda'] for data in company_data]
-        display_pnl_df['PEGレシオ'] = [data[3]['pegRatio'] for data in company_data]
-        display_pnl_df['時価総額'] = [data[3]['marketCap'] for data in company_data]
-        display_pnl_df['ベータ'] = [data[3]['beta'] for data in company_data]
-        display_pnl_df['配当利回り'] = [data[3]['dividendYield'] for data in company_data]
-        # 新しい財務指標を追加
-        display_pnl_df['ROE'] = [data[3]['returnOnEquity'] for data in company_data]
-        display_pnl_df['ROA'] = [data[3]['returnOnAssets'] for data in company_data]
-        display_pnl_df['営業利益率'] = [data[3]['operatingMargins'] for data in company_data]
-        display_pnl_df['純利益率'] = [data[3]['profitMargins'] for data in company_data]
+        valuation_columns = {
+            '予想PER': 'forwardPE',
+            'PBR': 'priceToBook',
+            'PSR': 'priceToSalesTrailing12Months',
+            'EV/EBITDA': 'enterpriseToEbitda',
+            'PEGレシオ': 'pegRatio',
+            '時価総額': 'marketCap',
+            'ベータ': 'beta',
+            '配当利回り': 'dividendYield',
+            'ROE': 'returnOnEquity',
+            'ROA': 'returnOnAssets',
+            '営業利益率': 'operatingMargins',
+            '純利益率': 'profitMargins'
+        }
+        for col, key in valuation_columns.items():
+            display_pnl_df[col] = [data[key] for data in valuations]
         
         # 数値カラムをフォーマット
         numeric_columns = ['avg_cost_jpy', 'current_price_jpy', 'current_value_jpy', 
                           'cost_basis_jpy', 'pnl_amount']
         
-        for col in numeric_columns:
-            if col in display_pnl_df.columns:
-                display_pnl_df[col] = display_pnl_df[col].apply(lambda x: format_currency(x))
-        
-        if 'pnl_percentage' in display_pnl_df.columns:
-            display_pnl_df['pnl_percentage'] = display_pnl_df['pnl_percentage'].apply(
-                lambda x: format_percentage(x)
+        # 列ごとの個別代入ではなくサブフレームへの一括代入にまとめる
+        cols_present = [col for col in numeric_columns if col in display_pnl_df.columns]
+        if cols_present:
+            display_pnl_df[cols_present] = pd.DataFrame(
+                {col: format_currency_array(display_pnl_df[col]) for col in cols_present},
+                index=display_pnl_df.index
             )
-        
+
+        if 'pnl_percentage' in display_pnl_df.columns:
+            display_pnl_df['pnl_percentage'] = format_percentage_array(display_pnl_df['pnl_percentage'])
+
         # カラム順序を調整（基本情報、損益情報、バリュエーション指標の順）
         basic_columns = ['ticker', '企業名', '本社所在国', '地域', 'セクター']
         pnl_columns = ['shares', 'avg_cost_jpy', 'current_price_jpy', 'current_value_jpy', 
@@ -1557,15 +1643,17 @@ def display_detailed_data(pnl_df: pd.DataFrame, original_df: pd.DataFrame, ticke
         numeric_columns = ['avg_cost_jpy', 'current_price_jpy', 'current_value_jpy', 
                           'cost_basis_jpy', 'pnl_amount']
         
-        for col in numeric_columns:
-            if col in display_pnl_df.columns:
-                display_pnl_df[col] = display_pnl_df[col].apply(lambda x: format_currency(x))
-        
-        if 'pnl_percentage' in display_pnl_df.columns:
-            display_pnl_df['pnl_percentage'] = display_pnl_df['pnl_percentage'].apply(
-                lambda x: format_percentage(x)
+        # 列ごとの個別代入ではなくサブフレームへの一括代入にまとめる
+        cols_present = [col for col in numeric_columns if col in display_pnl_df.columns]
+        if cols_present:
+            display_pnl_df[cols_present] = pd.DataFrame(
+                {col: format_currency_array(display_pnl_df[col]) for col in cols_present},
+                index=display_pnl_df.index
             )
-        
+
+        if 'pnl_percentage' in display_pnl_df.columns:
+            display_pnl_df['pnl_percentage'] = format_percentage_array(display_pnl_df['pnl_percentage'])
+
         st.dataframe(display_pnl_df, use_container_width=True)
     
     # オリジナルデータ
@@ -1576,19 +1664,17 @@ def display_detailed_data(pnl_df: pd.DataFrame, original_df: pd.DataFrame, ticke
     col1, col2 = st.columns(2)
     
     with col1:
-        pnl_csv = pnl_df.to_csv(index=False)
         st.download_button(
             label="📥 損益データをダウンロード",
-            data=pnl_csv,
+            data=_to_csv_bytes(pnl_df),
             file_name="portfolio_pnl.csv",
             mime="text/csv"
         )
-    
+
     with col2:
-        original_csv = original_df.to_csv(index=False)
         st.download_button(
             label="📥 オリジナルデータをダウンロード",
-            data=original_csv,
+            data=_to_csv_bytes(original_df),
             file_name="portfolio_original.csv",
             mime="text/csv"
         )
@@ -1704,29 +1790,37 @@ def display_stock_charts(tickers: List[str]):
                     chart_data = pd.DataFrame()
                 
                 if not chart_data.empty:
-                    # 終値ラインチャート
+                    # 終値ラインチャート（点数が多い場合はLTTBで間引いてから描画）
+                    plot_data = chart_data
+                    if len(chart_data) > 2000:
+                        sample_idx = lttb_downsample_indices(chart_data['Close'], 2000)
+                        plot_data = chart_data.iloc[sample_idx]
+
                     period_str = f"{from_date_dt.strftime('%Y-%m-%d')} to {to_date_dt.strftime('%Y-%m-%d')}"
-                    line_chart = create_stock_line_chart(chart_data, selected_ticker, period_str)
+                    line_chart = create_stock_line_chart(plot_data, selected_ticker, period_str)
                     st.plotly_chart(line_chart, use_container_width=True)
                     
                     # 基本統計情報
                     with st.expander("📈 期間統計"):
                         col1, col2, col3, col4 = st.columns(4)
-                        
-                        period_return = ((chart_data['Close'].iloc[-1] / chart_data['Close'].iloc[0]) - 1) * 100
-                        start_price = chart_data['Close'].iloc[0]
-                        end_price = chart_data['Close'].iloc[-1]
-                        max_price = chart_data['Close'].max()
-                        min_price = chart_data['Close'].min()
-                        
+
+                        # 統計値と表示文字列はwithブロックの外で先に作り、
+                        # カラムコンテキスト内は軽い引数渡しだけにする
+                        close_values = chart_data['Close'].to_numpy()
+                        period_return = ((close_values[-1] / close_values[0]) - 1) * 100
+                        period_return_text = f"{period_return:+.2f}%"
+                        start_price_text = f"{close_values[0]:.2f}"
+                        end_price_text = f"{close_values[-1]:.2f}"
+                        high_low_text = f"{close_values.max():.2f} / {close_values.min():.2f}"
+
                         with col1:
-                            st.metric("期間リターン", f"{period_return:+.2f}%")
+                            st.metric("期間リターン", period_return_text)
                         with col2:
-                            st.metric("開始価格", f"{start_price:.2f}")
+                            st.metric("開始価格", start_price_text)
                         with col3:
-                            st.metric("最新価格", f"{end_price:.2f}")
+                            st.metric("最新価格", end_price_text)
                         with col4:
-                            st.metric("期間高値/安値", f"{max_price:.2f} / {min_price:.2f}")
+                            st.metric("期間高値/安値", high_low_text)
                     
                     # Geminiニュース分析機能（チャートの下に配置）
                     st.markdown("---")
@@ -2371,6 +2465,9 @@ def calculate_portfolio_performance(pnl_df: pd.DataFrame, period_data: pd.DataFr
 
 def display_relative_performance_analysis(performance_result: Dict[str, Any]):
     """相対パフォーマンス分析結果の表示"""
+    # plotlyはこの関数でしか直接使わないため、起動時間短縮のため遅延インポート
+    import plotly.graph_objects as go
+
     try:
         if not performance_result.get("success", False):
             st.error(f"分析エラー: {performance_result.get('error', 'Unknown error')}")
@@ -3314,17 +3411,9 @@ def display_welcome_page():
     """)
     
     # サンプルファイルダウンロード
-    sample_data = {
-        'Ticker': ['AAPL', 'MSFT', '7203.T', 'ASML', 'TSLA'],
-        'Shares': [100, 50, 1000, 20, 30],
-        'AvgCostJPY': [15000, 25000, 800, 60000, 20000]
-    }
-    sample_df = pd.DataFrame(sample_data)
-    sample_csv = sample_df.to_csv(index=False)
-    
     st.download_button(
         label="📥 サンプルCSVファイルをダウンロード",
-        data=sample_csv,
+        data=_SAMPLE_PORTFOLIO_CSV,
         file_name="sample_portfolio.csv",
         mime="text/csv"
     )
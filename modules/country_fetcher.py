@@ -7,10 +7,64 @@ import yfinance as yf
 import streamlit as st
 import numpy as np
 from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import asyncio
+import json
+import os
+import threading
+import time
 import logging
 
+# aiohttpはオプション依存：未導入環境ではThreadPoolExecutor経路で動作する
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# 本社所在国のディスクキャッシュ設定
+# 国情報はほぼ変化しないため長期TTLで保持し、セッションをまたいだ
+# 再取得（コールドスタート時のネットワークアクセス）を避ける
+_COUNTRY_CACHE_PATH = os.path.join("data_cache", "ticker_countries.json")
+_COUNTRY_CACHE_TTL = 90 * 24 * 3600  # 90日
+_country_cache_lock = threading.Lock()
+_country_cache: Optional[Dict[str, list]] = None
+
+
+def _load_country_cache() -> Dict[str, list]:
+    """ディスク上の国情報キャッシュを読み込み（初回のみファイルアクセス）"""
+    global _country_cache
+    if _country_cache is None:
+        try:
+            with open(_COUNTRY_CACHE_PATH, 'r', encoding='utf-8') as f:
+                _country_cache = json.load(f)
+        except Exception:
+            _country_cache = {}
+    return _country_cache
+
+
+def _get_cached_country(ticker: str) -> Optional[str]:
+    """TTL内のキャッシュ済み国情報を返す（ミス時はNone）"""
+    entry = _load_country_cache().get(ticker)
+    if entry and time.time() - entry[1] < _COUNTRY_CACHE_TTL:
+        return entry[0]
+    return None
+
+
+def _store_cached_country(ticker: str, country: str):
+    """取得した国情報をディスクキャッシュへ書き戻し"""
+    with _country_cache_lock:
+        cache = _load_country_cache()
+        cache[ticker] = [country, time.time()]
+        try:
+            os.makedirs(os.path.dirname(_COUNTRY_CACHE_PATH), exist_ok=True)
+            with open(_COUNTRY_CACHE_PATH, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, ensure_ascii=False)
+        except Exception as e:
+            logger.debug(f"国情報キャッシュ保存失敗 {ticker}: {str(e)}")
+
 
 def get_alternative_ticker_info(ticker: str) -> Optional[dict]:
     """
@@ -243,29 +297,143 @@ def create_estimated_ticker_info(ticker: str) -> dict:
         }
 
 
-def get_ticker_country(ticker: str) -> Optional[str]:
+def _fetch_country_from_profile(ticker: str, session=None) -> Optional[str]:
+    """
+    assetProfileモジュールのみを問い合わせて国情報を取得（軽量版）
+
+    stock.info は財務・役員情報まで含む巨大なJSONを取得するため、
+    国情報だけが必要な場合はquoteSummaryのassetProfileに絞って
+    ペイロードを大幅に削減する。
+
+    Args:
+        ticker: ティッカーシンボル
+        session: 再利用するrequests.Session（省略時は都度接続）
+
+    Returns:
+        str: 本社所在国名、取得失敗時はNone
+    """
+    import requests
+
+    urls = [
+        f"https://query1.finance.yahoo.com/v10/finance/quoteSummary/{ticker}?modules=assetProfile",
+        f"https://query2.finance.yahoo.com/v10/finance/quoteSummary/{ticker}?modules=assetProfile"
+    ]
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    }
+    requester = session if session is not None else requests
+
+    for url in urls:
+        try:
+            response = requester.get(url, headers=headers, timeout=10)
+            if response.status_code == 200:
+                data = response.json()
+                results = data.get('quoteSummary', {}).get('result')
+                if results:
+                    profile = results[0].get('assetProfile', {})
+                    country = profile.get('country')
+                    if country and isinstance(country, str) and country.strip():
+                        return country.strip()
+        except Exception as e:
+            logger.debug(f"assetProfile取得失敗 {url}: {str(e)}")
+
+    return None
+
+
+async def _fetch_country_async(session, ticker: str) -> Optional[str]:
+    """
+    assetProfileモジュールを非同期で問い合わせて国情報を取得
+
+    Args:
+        session: aiohttp.ClientSession
+        ticker: ティッカーシンボル
+
+    Returns:
+        str: 本社所在国名、取得失敗時はNone
+    """
+    urls = [
+        f"https://query1.finance.yahoo.com/v10/finance/quoteSummary/{ticker}?modules=assetProfile",
+        f"https://query2.finance.yahoo.com/v10/finance/quoteSummary/{ticker}?modules=assetProfile"
+    ]
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    }
+
+    for url in urls:
+        try:
+            async with session.get(url, headers=headers,
+                                   timeout=aiohttp.ClientTimeout(total=10)) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    results = data.get('quoteSummary', {}).get('result')
+                    if results:
+                        profile = results[0].get('assetProfile', {})
+                        country = profile.get('country')
+                        if country and isinstance(country, str) and country.strip():
+                            return country.strip()
+        except Exception as e:
+            logger.debug(f"assetProfile非同期取得失敗 {url}: {str(e)}")
+
+    return None
+
+
+async def _gather_countries_async(tickers: List[str]) -> Dict[str, Optional[str]]:
+    """
+    複数銘柄の国情報を1スレッドの非同期I/Oで同時取得
+
+    Args:
+        tickers: ティッカーシンボルのリスト
+
+    Returns:
+        Dict[str, Optional[str]]: ティッカーをキーとした本社所在国の辞書
+    """
+    connector = aiohttp.TCPConnector(limit=32)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        results = await asyncio.gather(
+            *[_fetch_country_async(session, ticker) for ticker in tickers]
+        )
+    return dict(zip(tickers, results))
+
+
+def get_ticker_country(ticker: str, session=None) -> Optional[str]:
     """
     ティッカーシンボルから本社所在国を取得
-    
+
     Args:
         ticker: ティッカーシンボル
-    
+        session: 再利用するrequests.Session（接続プーリング用、省略可）
+
     Returns:
         str: 本社所在国名、取得失敗時はNone
     """
     try:
-        stock = yf.Ticker(ticker)
+        # ディスクキャッシュを最優先（セッションをまたいで有効）
+        cached = _get_cached_country(ticker)
+        if cached:
+            logger.debug(f"国情報キャッシュヒット: {ticker} -> {cached}")
+            return cached
+
+        # まず軽量なassetProfileエンドポイントを試す
+        country = _fetch_country_from_profile(ticker, session=session)
+        if country:
+            logger.debug(f"取得成功（assetProfile）: {ticker} -> {country}")
+            _store_cached_country(ticker, country)
+            return country
+
+        # 失敗時のみフルのinfo取得にフォールバック
+        stock = yf.Ticker(ticker, session=session) if session is not None else yf.Ticker(ticker)
         info = stock.info
-        
+
         # 'country'フィールドから取得
         country = info.get('country')
         if country:
             logger.debug(f"取得成功: {ticker} -> {country}")
+            _store_cached_country(ticker, country)
             return country
         else:
             logger.warning(f"国情報が見つかりません: {ticker}")
             return None
-            
+
     except Exception as e:
         logger.error(f"国情報取得エラー {ticker}: {str(e)}")
         return None
@@ -392,26 +560,76 @@ def get_ticker_valuation(ticker: str) -> Dict[str, Optional[float]]:
                                     'enterpriseToEbitda', 'pegRatio', 'marketCap', 'beta', 'dividendYield']}
 
 
-def get_multiple_ticker_countries(tickers: List[str]) -> Dict[str, Optional[str]]:
+def get_multiple_ticker_countries(tickers: List[str], max_workers: int = 8) -> Dict[str, Optional[str]]:
     """
     複数銘柄の本社所在国を一括取得
-    
+
+    取得はネットワーク待ちが支配的なため、ThreadPoolExecutorで
+    銘柄ごとの取得を並列実行する。1銘柄の失敗・遅延は他銘柄に影響させず、
+    失敗時はNoneを保持する（従来と同じセマンティクス）。
+
     Args:
         tickers: ティッカーシンボルのリスト
-    
+        max_workers: 並列実行するワーカー数
+
     Returns:
         Dict[str, Optional[str]]: ティッカーをキーとした本社所在国の辞書
     """
-    countries = {}
-    
-    for ticker in tickers:
+    countries = {ticker: None for ticker in tickers}
+
+    if not tickers:
+        return countries
+
+    # ロット単位データ等で同一ティッカーが重複していても1回しか取得しない
+    # （結果のdictはティッカーがキーなので、重複分は自然に同じ値を共有する）
+    unique_tickers = list(dict.fromkeys(tickers))
+
+    # ディスクキャッシュで解決できる銘柄はネットワークに出さない
+    pending = []
+    for ticker in unique_tickers:
+        cached = _get_cached_country(ticker)
+        if cached:
+            countries[ticker] = cached
+        else:
+            pending.append(ticker)
+
+    # aiohttpが使える場合は1スレッドの非同期I/Oで一括取得
+    if pending and AIOHTTP_AVAILABLE:
         try:
-            country = get_ticker_country(ticker)
-            countries[ticker] = country
+            fetched = asyncio.run(_gather_countries_async(pending))
+            for ticker, country in fetched.items():
+                if country:
+                    countries[ticker] = country
+                    _store_cached_country(ticker, country)
+            pending = [t for t in pending if countries[t] is None]
         except Exception as e:
-            logger.error(f"国情報取得エラー {ticker}: {str(e)}")
-            countries[ticker] = None
-    
+            logger.error(f"非同期国情報取得エラー: {str(e)}")
+
+    # 残り（aiohttp未導入・assetProfileで取れなかった銘柄）はスレッドプールで
+    # get_ticker_countryのフルフォールバック込みの取得を行う
+    if pending:
+        import requests
+
+        # ワーカー間で1つのSessionを共有し、keep-aliveで接続を再利用する
+        # （requests.Sessionのスレッド間共有はGET専用のこの用途では安全）
+        session = requests.Session()
+        try:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as executor:
+                future_to_ticker = {
+                    executor.submit(get_ticker_country, ticker, session): ticker
+                    for ticker in pending
+                }
+
+                for future in as_completed(future_to_ticker):
+                    ticker = future_to_ticker[future]
+                    try:
+                        countries[ticker] = future.result(timeout=30)
+                    except Exception as e:
+                        logger.error(f"国情報取得エラー {ticker}: {str(e)}")
+                        countries[ticker] = None
+        finally:
+            session.close()
+
     logger.info(f"本社所在国取得完了: {len([c for c in countries.values() if c])}/{len(tickers)}銘柄")
     return countries
 
@@ -987,60 +1205,49 @@ def get_multiple_ticker_complete_info(tickers: List[str], exchange_rates: Dict[s
     return ticker_info
 
 
+# 国名（大文字）→地域のマッピング
+# 呼び出しごとに地域リストを再構築してリニアサーチする代わりに、
+# モジュールレベルの辞書を1回のハッシュ参照で引く
+_EUROPEAN_COUNTRIES = frozenset([
+    'GERMANY', 'FRANCE', 'UNITED KINGDOM', 'UK', 'GREAT BRITAIN',
+    'ITALY', 'SPAIN', 'NETHERLANDS', 'SWITZERLAND', 'SWEDEN',
+    'NORWAY', 'DENMARK', 'FINLAND', 'BELGIUM', 'AUSTRIA',
+    'IRELAND', 'PORTUGAL', 'LUXEMBOURG', 'GREECE', 'POLAND',
+    'CZECH REPUBLIC', 'HUNGARY', 'SLOVAKIA', 'SLOVENIA',
+    'CROATIA', 'ROMANIA', 'BULGARIA', 'ESTONIA', 'LATVIA',
+    'LITHUANIA', 'MALTA', 'CYPRUS'
+])
+
+_ASIA_PACIFIC_COUNTRIES = frozenset([
+    'CHINA', 'SOUTH KOREA', 'KOREA', 'TAIWAN', 'HONG KONG',
+    'SINGAPORE', 'MALAYSIA', 'THAILAND', 'INDONESIA',
+    'PHILIPPINES', 'VIETNAM', 'INDIA', 'AUSTRALIA',
+    'NEW ZEALAND'
+])
+
+_REGION_BY_COUNTRY: Dict[str, str] = {
+    'JAPAN': '日本',
+    'UNITED STATES': '米国', 'USA': '米国', 'US': '米国',
+    'CANADA': '北米（その他）',
+    **{c: '欧州' for c in _EUROPEAN_COUNTRIES},
+    **{c: 'アジア太平洋' for c in _ASIA_PACIFIC_COUNTRIES}
+}
+
+
 def classify_region_by_country(country: Optional[str]) -> str:
     """
     本社所在国から地域を分類
-    
+
     Args:
         country: 本社所在国名
-    
+
     Returns:
         str: 地域名（日本、米国、欧州、アジア太平洋、その他）
     """
     if not country or country.strip() == '':
         return "その他"
-    
-    country = country.upper().strip()
-    
-    # 日本
-    if country in ['JAPAN']:
-        return "日本"
-    
-    # 米国
-    if country in ['UNITED STATES', 'USA', 'US']:
-        return "米国"
-    
-    # 欧州
-    european_countries = [
-        'GERMANY', 'FRANCE', 'UNITED KINGDOM', 'UK', 'GREAT BRITAIN',
-        'ITALY', 'SPAIN', 'NETHERLANDS', 'SWITZERLAND', 'SWEDEN',
-        'NORWAY', 'DENMARK', 'FINLAND', 'BELGIUM', 'AUSTRIA',
-        'IRELAND', 'PORTUGAL', 'LUXEMBOURG', 'GREECE', 'POLAND',
-        'CZECH REPUBLIC', 'HUNGARY', 'SLOVAKIA', 'SLOVENIA',
-        'CROATIA', 'ROMANIA', 'BULGARIA', 'ESTONIA', 'LATVIA',
-        'LITHUANIA', 'MALTA', 'CYPRUS'
-    ]
-    
-    if country in european_countries:
-        return "欧州"
-    
-    # アジア太平洋
-    asia_pacific_countries = [
-        'CHINA', 'SOUTH KOREA', 'KOREA', 'TAIWAN', 'HONG KONG',
-        'SINGAPORE', 'MALAYSIA', 'THAILAND', 'INDONESIA',
-        'PHILIPPINES', 'VIETNAM', 'INDIA', 'AUSTRALIA',
-        'NEW ZEALAND'
-    ]
-    
-    if country in asia_pacific_countries:
-        return "アジア太平洋"
-    
-    # カナダ
-    if country in ['CANADA']:
-        return "北米（その他）"
-    
-    # その他
-    return "その他"
+
+    return _REGION_BY_COUNTRY.get(country.upper().strip(), "その他")
 
 
 @st.cache_data(ttl=3600)  # 1時間キャッシュ
@@ -126,7 +126,10 @@ def clean_portfolio_data(df: pd.DataFrame) -> pd.DataFrame:
     
     # インデックスをリセット
     cleaned_df = cleaned_df.reset_index(drop=True)
-    
+
+    # ティッカーはカテゴリ型に変換（以降のisin/groupbyが整数コード比較になる）
+    cleaned_df['Ticker'] = cleaned_df['Ticker'].astype('category')
+
     logger.info(f"データクリーニング完了: {len(cleaned_df)}銘柄")
     return cleaned_df
 
@@ -15,6 +15,7 @@ from datetime import datetime, timedelta
 import json
 import pickle
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
@@ -64,8 +65,8 @@ class DataManager:
         """
         logger.info(f"ポートフォリオデータ一括取得開始: {len(portfolio_df)}銘柄")
         
-        # ティッカーリストを取得
-        tickers = portfolio_df['Ticker'].tolist()
+        # ティッカーリストを取得（カテゴリ型でも文字列リストを返す）
+        tickers = portfolio_df['Ticker'].astype(str).tolist()
         
         # プログレスバー設定
         try:
@@ -77,26 +78,20 @@ class DataManager:
         
         data_bundle = {}
         
-        # 1. 現在株価取得 (20%)
+        # 1-3. 現在株価・為替レート・企業情報取得 (50%)
+        # 互いに独立したI/O待ちの取得のため、ThreadPoolExecutorで並列実行する
         if show_progress:
             progress_bar.progress(0.1)
-            status_text.text("現在株価を取得中...")
-        
-        data_bundle['current_prices'] = self.get_current_prices(tickers)
-        
-        # 2. 為替レート取得 (30%)
-        if show_progress:
-            progress_bar.progress(0.2)
-            status_text.text("為替レートを取得中...")
-        
-        data_bundle['exchange_rates'] = self.get_exchange_rates()
-        
-        # 3. 企業情報取得 (50%)
-        if show_progress:
-            progress_bar.progress(0.3)
-            status_text.text("企業情報を取得中...")
-        
-        data_bundle['company_info'] = self.get_company_info_batch(tickers)
+            status_text.text("現在株価・為替レート・企業情報を並列取得中...")
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            future_prices = executor.submit(self.get_current_prices, tickers)
+            future_rates = executor.submit(self.get_exchange_rates)
+            future_company = executor.submit(self.get_company_info_batch, tickers)
+
+            data_bundle['current_prices'] = future_prices.result()
+            data_bundle['exchange_rates'] = future_rates.result()
+            data_bundle['company_info'] = future_company.result()
         
         # 4. 過去5年分の株価データ取得 (70%)
         if show_progress:
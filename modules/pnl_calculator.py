@@ -5,9 +5,13 @@
 
 import pandas as pd
 import numpy as np
+import streamlit as st
 from typing import Dict, List, Tuple, Optional
+from functools import lru_cache
 import logging
 
+from modules.pnl_kernels import perf_metrics_kernel, position_sizing_kernel
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,22 +36,19 @@ def calculate_pnl(
         dict: 損益情報
     """
     try:
-        # 現在価格を日本円に換算
+        # 日本円換算・評価額・簿価・損益を一括計算
+        # （一括処理はcalculate_portfolio_pnlの列演算側で行うため、ここはスカラAPIのみ）
         current_price_jpy = current_price_local * exchange_rate
-        
-        # 現在評価額
         current_value_jpy = current_price_jpy * shares
-        
-        # 投資額（簿価）
         cost_basis_jpy = avg_cost_jpy * shares
-        
-        # 損益額
         pnl_amount = current_value_jpy - cost_basis_jpy
-        
-        # 損益率
         pnl_percentage = (pnl_amount / cost_basis_jpy) * 100 if cost_basis_jpy > 0 else 0
-        
-        result = {
+
+        # f-string整形自体が呼び出しごとのコストになるため、DEBUG有効時のみ組み立てる
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"損益計算完了 {ticker}: {pnl_amount:,.0f}円 ({pnl_percentage:.2f}%)")
+
+        return {
             'ticker': ticker,
             'shares': shares,
             'avg_cost_jpy': avg_cost_jpy,
@@ -59,11 +60,8 @@ def calculate_pnl(
             'pnl_amount': pnl_amount,
             'pnl_percentage': pnl_percentage
         }
-        
-        logger.debug(f"損益計算完了 {ticker}: {pnl_amount:,.0f}円 ({pnl_percentage:.2f}%)")
-        return result
-        
-    except Exception as e:
+
+    except (TypeError, ValueError, ZeroDivisionError) as e:
         logger.error(f"損益計算エラー {ticker}: {str(e)}")
         return {
             'ticker': ticker,
@@ -79,6 +77,7 @@ def calculate_pnl(
         }
 
 
+@st.cache_data(ttl=300, show_spinner=False)
 def calculate_portfolio_pnl(
     portfolio_df: pd.DataFrame,
     current_prices: Dict[str, float],
@@ -97,85 +96,133 @@ def calculate_portfolio_pnl(
     Returns:
         pd.DataFrame: 損益計算結果
     """
-    pnl_results = []
-    
-    for _, row in portfolio_df.iterrows():
-        ticker = row['Ticker']
-        shares = row['Shares']
-        avg_cost_jpy = row['AvgCostJPY']
-        
-        # 現在株価を取得
-        current_price_local = current_prices.get(ticker, 0)
-        
-        # 通貨と為替レートを取得
-        currency = currency_mapping.get(ticker, 'USD')
-        exchange_rate = get_exchange_rate_for_currency(currency, exchange_rates)
-        
-        # 損益計算
-        pnl_data = calculate_pnl(
-            ticker=ticker,
-            shares=shares,
-            avg_cost_jpy=avg_cost_jpy,
-            current_price_local=current_price_local,
-            exchange_rate=exchange_rate
-        )
-        
-        # 通貨情報を追加
-        pnl_data['currency'] = currency
-        
-        pnl_results.append(pnl_data)
-    
-    # DataFrameに変換
-    pnl_df = pd.DataFrame(pnl_results)
-    
+    # iterrowsによる行単位のPythonループではなく列演算で一括計算する
+    # CSV由来でobject dtypeになっている可能性があるため、入口で1回だけ数値に正規化する
+    tickers = portfolio_df['Ticker'].astype(str)
+    shares = pd.to_numeric(portfolio_df['Shares'], errors='coerce').fillna(0.0).to_numpy(dtype=float)
+    avg_cost_jpy = pd.to_numeric(portfolio_df['AvgCostJPY'], errors='coerce').fillna(0.0).to_numpy(dtype=float)
+
+    # 現在株価・通貨・為替レートをマッピング
+    current_price_local = tickers.map(current_prices).fillna(0.0).to_numpy(dtype=float)
+    currency = tickers.map(currency_mapping).fillna('USD')
+
+    # 為替レートの解決は行ごとではなく、出現する通貨ごとに1回だけ行う
+    fx_lookup = {
+        c: get_exchange_rate_for_currency(c, exchange_rates)
+        for c in currency.unique()
+    }
+    exchange_rate = currency.map(fx_lookup).to_numpy(dtype=float)
+
+    # 損益計算（calculate_pnlと同じ式を列単位で適用）
+    current_price_jpy = current_price_local * exchange_rate
+    current_value_jpy = current_price_jpy * shares
+    cost_basis_jpy = avg_cost_jpy * shares
+    pnl_amount = current_value_jpy - cost_basis_jpy
+    pnl_percentage = np.where(cost_basis_jpy > 0, pnl_amount / np.where(cost_basis_jpy > 0, cost_basis_jpy, 1.0) * 100, 0.0)
+
+    pnl_df = pd.DataFrame({
+        'ticker': tickers.to_numpy(),
+        'shares': shares,
+        'avg_cost_jpy': avg_cost_jpy,
+        'current_price_local': current_price_local,
+        'current_price_jpy': current_price_jpy,
+        'exchange_rate': exchange_rate,
+        'current_value_jpy': current_value_jpy,
+        'cost_basis_jpy': cost_basis_jpy,
+        'pnl_amount': pnl_amount,
+        'pnl_percentage': pnl_percentage,
+        'currency': currency.to_numpy()
+    })
+
+    # float64/objectのままだと列ごとのメモリと帯域が倍になるため、
+    # 数値列はfloat32に、ticker/currencyはcategoryに落とす
+    pnl_df = pnl_df.astype({
+        'shares': 'float32',
+        'avg_cost_jpy': 'float32',
+        'current_price_local': 'float32',
+        'current_price_jpy': 'float32',
+        'exchange_rate': 'float32',
+        'current_value_jpy': 'float32',
+        'cost_basis_jpy': 'float32',
+        'pnl_amount': 'float32',
+        'pnl_percentage': 'float32',
+        'ticker': 'category',
+        'currency': 'category'
+    })
+
     logger.info(f"ポートフォリオ損益計算完了: {len(pnl_df)}銘柄")
     return pnl_df
 
 
+# 通貨コードと為替レートシンボルのマッピング（呼び出しごとに再構築しない）
+_RATE_SYMBOL_BY_CURRENCY = {
+    'USD': 'USDJPY=X',
+    'EUR': 'EURJPY=X',
+    'GBP': 'GBPJPY=X',
+    'AUD': 'AUDJPY=X',
+    'CAD': 'CADJPY=X',
+    'CHF': 'CHFJPY=X'
+}
+
+# フォールバック：概算レート
+_FALLBACK_RATES = {
+    'USD': 150.0,
+    'EUR': 160.0,
+    'GBP': 180.0,
+    'AUD': 100.0,
+    'CAD': 110.0,
+    'CHF': 165.0,
+    'HKD': 19.0,
+    'SGD': 110.0,
+    'CNY': 21.0,
+    'KRW': 0.11
+}
+
+
+@lru_cache(maxsize=64)
+def _get_rate_for_currency_cached(currency: str, rate_items: Tuple[Tuple[str, float], ...]) -> float:
+    """
+    為替レート解決のメモ化本体（辞書をタプル化したキーで呼び出す）
+
+    Args:
+        currency: 通貨コード
+        rate_items: 為替レート辞書をsortedタプル化したもの
+
+    Returns:
+        float: 為替レート（JPYに対する）
+    """
+    if currency == 'JPY':
+        return 1.0
+
+    rate_symbol = _RATE_SYMBOL_BY_CURRENCY.get(currency)
+    if rate_symbol:
+        for symbol, rate in rate_items:
+            if symbol == rate_symbol:
+                return rate
+
+    return _FALLBACK_RATES.get(currency, 1.0)
+
+
 def get_exchange_rate_for_currency(currency: str, exchange_rates: Dict[str, float]) -> float:
     """
     通貨に対応する為替レートを取得
-    
+
     Args:
         currency: 通貨コード
         exchange_rates: 為替レート辞書
-    
+
     Returns:
         float: 為替レート（JPYに対する）
     """
     if currency == 'JPY':
         return 1.0
-    
-    rate_mapping = {
-        'USD': 'USDJPY=X',
-        'EUR': 'EURJPY=X',
-        'GBP': 'GBPJPY=X',
-        'AUD': 'AUDJPY=X',
-        'CAD': 'CADJPY=X',
-        'CHF': 'CHFJPY=X'
-    }
-    
-    rate_symbol = rate_mapping.get(currency)
-    if rate_symbol and rate_symbol in exchange_rates:
-        return exchange_rates[rate_symbol]
-    
-    # フォールバック：概算レート
-    fallback_rates = {
-        'USD': 150.0,
-        'EUR': 160.0,
-        'GBP': 180.0,
-        'AUD': 100.0,
-        'CAD': 110.0,
-        'CHF': 165.0,
-        'HKD': 19.0,
-        'SGD': 110.0,
-        'CNY': 21.0,
-        'KRW': 0.11
-    }
-    
-    return fallback_rates.get(currency, 1.0)
 
+    return _get_rate_for_currency_cached(
+        currency, tuple(sorted(exchange_rates.items())) if exchange_rates else ()
+    )
 
+
+@st.cache_data(ttl=300, show_spinner=False)
 def calculate_portfolio_summary(pnl_df: pd.DataFrame) -> Dict[str, float]:
     """
     ポートフォリオサマリーの計算
@@ -187,26 +234,35 @@ def calculate_portfolio_summary(pnl_df: pd.DataFrame) -> Dict[str, float]:
         dict: ポートフォリオサマリー
     """
     try:
-        total_cost_basis = pnl_df['cost_basis_jpy'].sum()
-        total_current_value = pnl_df['current_value_jpy'].sum()
-        total_pnl_amount = pnl_df['pnl_amount'].sum()
-        
+        # 列を1度だけndarrayとして取り出し、pandasのリダクションを
+        # 列ごとに繰り返し走らせない
+        pnl_amounts = pnl_df['pnl_amount'].to_numpy()
+        pnl_pcts = pnl_df['pnl_percentage'].to_numpy()
+
+        total_cost_basis = float(pnl_df['cost_basis_jpy'].to_numpy().sum())
+        total_current_value = float(pnl_df['current_value_jpy'].to_numpy().sum())
+        total_pnl_amount = float(pnl_amounts.sum())
+
         overall_pnl_percentage = (total_pnl_amount / total_cost_basis) * 100 if total_cost_basis > 0 else 0
-        
+
         # 勝率計算
-        profitable_positions = (pnl_df['pnl_amount'] > 0).sum()
+        profitable_positions = int((pnl_amounts > 0).sum())
         total_positions = len(pnl_df)
         win_rate = (profitable_positions / total_positions) * 100 if total_positions > 0 else 0
-        
-        # 最大・最小損益
-        max_gain = pnl_df['pnl_amount'].max()
-        max_loss = pnl_df['pnl_amount'].min()
-        max_gain_pct = pnl_df['pnl_percentage'].max()
-        max_loss_pct = pnl_df['pnl_percentage'].min()
-        
-        # 最大・最小損益銘柄
-        max_gain_ticker = pnl_df.loc[pnl_df['pnl_amount'].idxmax(), 'ticker'] if not pnl_df.empty else ''
-        max_loss_ticker = pnl_df.loc[pnl_df['pnl_amount'].idxmin(), 'ticker'] if not pnl_df.empty else ''
+
+        # 最大・最小損益（インデックス位置を1回ずつ求めて値と銘柄を同時に取得）
+        if total_positions > 0:
+            idx_max = int(np.argmax(pnl_amounts))
+            idx_min = int(np.argmin(pnl_amounts))
+            max_gain = pnl_amounts[idx_max]
+            max_loss = pnl_amounts[idx_min]
+            max_gain_pct = pnl_pcts.max()
+            max_loss_pct = pnl_pcts.min()
+            max_gain_ticker = pnl_df['ticker'].iat[idx_max]
+            max_loss_ticker = pnl_df['ticker'].iat[idx_min]
+        else:
+            max_gain = max_loss = max_gain_pct = max_loss_pct = np.nan
+            max_gain_ticker = max_loss_ticker = ''
         
         summary = {
             'total_positions': total_positions,
@@ -234,6 +290,7 @@ def calculate_portfolio_summary(pnl_df: pd.DataFrame) -> Dict[str, float]:
         return {}
 
 
+@st.cache_data(ttl=300, show_spinner=False)
 def calculate_sector_allocation_by_region(pnl_df: pd.DataFrame, ticker_countries: dict = None) -> pd.DataFrame:
     """
     地域別配分の計算（Yahoo Finance country情報ベース）
@@ -294,14 +351,15 @@ def calculate_sector_allocation_by_region(pnl_df: pd.DataFrame, ticker_countries
                     else:
                         return 'その他'
         
-        # 地域分類を適用
-        pnl_df_copy = pnl_df.copy()
-        pnl_df_copy['country'] = pnl_df_copy['ticker'].apply(get_region_for_ticker)
-        
-        logger.info(f"地域分類結果: {pnl_df_copy['country'].value_counts().to_dict()}")
-        
+        # 地域分類を適用（ユニーク銘柄ごとに1回だけ分類し、行単位のapplyを避ける）
+        region_by_ticker = {t: get_region_for_ticker(t) for t in pnl_df['ticker'].unique()}
+        # DataFrame全体をコピーせず、外部Seriesをgroupbyキーとして使う
+        country_col = pnl_df['ticker'].map(region_by_ticker).rename('country')
+
+        logger.info(f"地域分類結果: {country_col.value_counts().to_dict()}")
+
         # 地域別集計
-        sector_allocation = pnl_df_copy.groupby('country').agg({
+        sector_allocation = pnl_df.groupby(country_col, observed=True).agg({
             'current_value_jpy': 'sum',
             'cost_basis_jpy': 'sum',
             'pnl_amount': 'sum',
@@ -336,6 +394,7 @@ def calculate_sector_allocation_by_region(pnl_df: pd.DataFrame, ticker_countries
         return pd.DataFrame()
 
 
+@st.cache_data(ttl=300, show_spinner=False)
 def calculate_sector_allocation(pnl_df: pd.DataFrame, ticker_info: dict = None) -> pd.DataFrame:
     """
     セクター別配分の計算（Yahoo Finance sector情報ベース）
@@ -365,14 +424,15 @@ def calculate_sector_allocation(pnl_df: pd.DataFrame, ticker_info: dict = None)
             else:
                 return "その他"
         
-        # セクター分類を適用
-        pnl_df_copy = pnl_df.copy()
-        pnl_df_copy['sector'] = pnl_df_copy['ticker'].apply(get_sector_for_ticker)
-        
-        logger.info(f"セクター分類結果: {pnl_df_copy['sector'].value_counts().to_dict()}")
-        
+        # セクター分類を適用（ユニーク銘柄ごとに1回だけ分類し、行単位のapplyを避ける）
+        sector_by_ticker = {t: get_sector_for_ticker(t) for t in pnl_df['ticker'].unique()}
+        # DataFrame全体をコピーせず、外部Seriesをgroupbyキーとして使う
+        sector_col = pnl_df['ticker'].map(sector_by_ticker).rename('sector')
+
+        logger.info(f"セクター分類結果: {sector_col.value_counts().to_dict()}")
+
         # セクター別集計
-        sector_allocation = pnl_df_copy.groupby('sector').agg({
+        sector_allocation = pnl_df.groupby(sector_col, observed=True).agg({
             'current_value_jpy': 'sum',
             'cost_basis_jpy': 'sum',
             'pnl_amount': 'sum',
@@ -407,6 +467,7 @@ def calculate_sector_allocation(pnl_df: pd.DataFrame, ticker_info: dict = None)
         return pd.DataFrame()
 
 
+@st.cache_data(ttl=300, show_spinner=False)
 def calculate_performance_metrics(pnl_df: pd.DataFrame, risk_free_rate: float = 0.1) -> Dict[str, float]:
     """
     パフォーマンス指標の計算
@@ -422,22 +483,17 @@ def calculate_performance_metrics(pnl_df: pd.DataFrame, risk_free_rate: float =
         if pnl_df.empty:
             return {}
         
+        # 配列を1度だけ取り出し、単一パスのカーネルで全指標を計算
+        pnl_pct = pnl_df['pnl_percentage'].to_numpy(dtype=np.float64)
+        values = pnl_df['current_value_jpy'].to_numpy(dtype=np.float64)
+
         # 重み（時価総額比率）を計算
-        total_value = pnl_df['current_value_jpy'].sum()
-        weights = pnl_df['current_value_jpy'] / total_value if total_value > 0 else np.ones(len(pnl_df)) / len(pnl_df)
-        
-        # 重み付き平均リターン
-        weighted_return = (pnl_df['pnl_percentage'] * weights).sum()
-        
-        # 銘柄別リターンの標準偏差（簡易版）
-        returns_std = pnl_df['pnl_percentage'].std()
-        
-        # シャープレシオ（簡易計算）
-        excess_return = weighted_return - risk_free_rate
-        sharpe_ratio = excess_return / returns_std if returns_std > 0 else 0
-        
-        # 最大ドローダウン（単純版：最大損失銘柄）
-        max_drawdown = pnl_df['pnl_percentage'].min()
+        total_value = values.sum()
+        weights = values / total_value if total_value > 0 else np.full(len(pnl_df), 1.0 / len(pnl_df))
+
+        weighted_return, returns_std, sharpe_ratio, max_drawdown = perf_metrics_kernel(
+            pnl_pct, weights, float(risk_free_rate)
+        )
         
         metrics = {
             'weighted_return': weighted_return,
@@ -455,6 +511,7 @@ def calculate_performance_metrics(pnl_df: pd.DataFrame, risk_free_rate: float =
         return {}
 
 
+@st.cache_data(ttl=300, show_spinner=False)
 def calculate_position_sizing_analysis(pnl_df: pd.DataFrame) -> Dict[str, any]:
     """
     ポジションサイジング分析
@@ -469,22 +526,24 @@ def calculate_position_sizing_analysis(pnl_df: pd.DataFrame) -> Dict[str, any]:
         if pnl_df.empty:
             return {}
         
-        total_value = pnl_df['current_value_jpy'].sum()
-        
-        # 各ポジションの比率
-        pnl_df['position_weight'] = pnl_df['current_value_jpy'] / total_value * 100
-        
-        # 集中度分析
-        top_5_weight = pnl_df.nlargest(5, 'position_weight')['position_weight'].sum()
-        top_10_weight = pnl_df.nlargest(10, 'position_weight')['position_weight'].sum()
-        
-        # ハーフィンダール指数（集中度指標）
-        hhi = (pnl_df['position_weight'] ** 2).sum()
-        
+        values = pnl_df['current_value_jpy'].to_numpy(dtype=np.float64)
+        total_value = values.sum()
+
+        # 各ポジションの比率（ローカル配列のみで計算し、呼び出し元のDataFrameを書き換えない）
+        weights_pct = values / total_value * 100
+
+        # 集中度分析（nlargestの全ソートではなくnp.partitionの部分ソートで上位k件を取得）
+        top_5_k = min(5, len(weights_pct))
+        top_10_k = min(10, len(weights_pct))
+        top_5_weight = np.partition(weights_pct, -top_5_k)[-top_5_k:].sum()
+        top_10_weight = np.partition(weights_pct, -top_10_k)[-top_10_k:].sum()
+
+        # HHI・分散・最大/最小ウェイトは単一パスのカーネルでまとめて計算
+        hhi, weight_variance, max_weight, min_weight, idx_max, idx_min = position_sizing_kernel(weights_pct)
+
         # 等分散からの偏差
         equal_weight = 100 / len(pnl_df)
-        weight_variance = pnl_df['position_weight'].var()
-        
+
         analysis = {
             'total_positions': len(pnl_df),
             'top_5_concentration': top_5_weight,
@@ -492,10 +551,10 @@ def calculate_position_sizing_analysis(pnl_df: pd.DataFrame) -> Dict[str, any]:
             'herfindahl_index': hhi,
             'equal_weight_benchmark': equal_weight,
             'weight_variance': weight_variance,
-            'max_position_weight': pnl_df['position_weight'].max(),
-            'min_position_weight': pnl_df['position_weight'].min(),
-            'largest_position': pnl_df.loc[pnl_df['position_weight'].idxmax(), 'ticker'],
-            'smallest_position': pnl_df.loc[pnl_df['position_weight'].idxmin(), 'ticker']
+            'max_position_weight': max_weight,
+            'min_position_weight': min_weight,
+            'largest_position': pnl_df['ticker'].iat[idx_max],
+            'smallest_position': pnl_df['ticker'].iat[idx_min]
         }
         
         logger.info(f"ポジションサイジング分析完了: 上位5銘柄集中度 {top_5_weight:.1f}%")
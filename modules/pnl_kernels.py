@@ -0,0 +1,97 @@
+"""
+損益計算の数値カーネルモジュール
+パフォーマンス指標・ポジションサイジングのリダクションを単一パスで計算する
+numbaが利用可能な場合はJITコンパイルで高速化する（無くても同じ結果で動作）
+"""
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """numba未導入時は関数をそのまま返すフォールバックデコレータ"""
+        if args and callable(args[0]):
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
+
+
+@njit(cache=True)
+def perf_metrics_kernel(pnl_pct: np.ndarray, weights: np.ndarray, risk_free_rate: float):
+    """
+    パフォーマンス指標を単一パスで計算するカーネル
+
+    Args:
+        pnl_pct: 銘柄別損益率（%）の配列
+        weights: 時価総額比率（合計1.0）の配列
+        risk_free_rate: リスクフリーレート（年率%）
+
+    Returns:
+        tuple: (weighted_return, returns_std, sharpe_ratio, max_drawdown)
+    """
+    n = pnl_pct.shape[0]
+    weighted_return = 0.0
+    mean = 0.0
+    max_drawdown = pnl_pct[0]
+    for i in range(n):
+        weighted_return += pnl_pct[i] * weights[i]
+        mean += pnl_pct[i]
+        if pnl_pct[i] < max_drawdown:
+            max_drawdown = pnl_pct[i]
+    mean /= n
+
+    ssq = 0.0
+    for i in range(n):
+        d = pnl_pct[i] - mean
+        ssq += d * d
+    returns_std = np.sqrt(ssq / (n - 1)) if n > 1 else 0.0
+
+    sharpe_ratio = (weighted_return - risk_free_rate) / returns_std if returns_std > 0 else 0.0
+    return weighted_return, returns_std, sharpe_ratio, max_drawdown
+
+
+@njit(cache=True)
+def position_sizing_kernel(weights_pct: np.ndarray):
+    """
+    ポジションウェイトの集中度指標を単一パスで計算するカーネル
+
+    Args:
+        weights_pct: 各ポジションの比率（%）の配列
+
+    Returns:
+        tuple: (hhi, weight_variance, max_weight, min_weight, idx_max, idx_min)
+    """
+    n = weights_pct.shape[0]
+    hhi = 0.0
+    mean = 0.0
+    max_weight = weights_pct[0]
+    min_weight = weights_pct[0]
+    idx_max = 0
+    idx_min = 0
+    for i in range(n):
+        w = weights_pct[i]
+        hhi += w * w
+        mean += w
+        if w > max_weight:
+            max_weight = w
+            idx_max = i
+        if w < min_weight:
+            min_weight = w
+            idx_min = i
+    mean /= n
+
+    ssq = 0.0
+    for i in range(n):
+        d = weights_pct[i] - mean
+        ssq += d * d
+    weight_variance = ssq / (n - 1) if n > 1 else 0.0
+
+    return hhi, weight_variance, max_weight, min_weight, idx_max, idx_min
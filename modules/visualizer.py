@@ -5,15 +5,175 @@
 
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional
+import functools
+import hashlib
 import logging
+import pickle
+
+from modules.pnl_kernels import njit, NUMBA_AVAILABLE
+
+# Figure→JSONのシリアライズはorjsonエンジンが使える場合に切り替える
+# （ndarrayはb64のtyped arrayとして出力され、ペイロードが大幅に縮む）
+try:
+    import orjson  # noqa: F401
+    pio.json.config.default_engine = 'orjson'
+except ImportError:
+    pass
 
 logger = logging.getLogger(__name__)
 
+# 同一データからのFigure再構築を避けるモジュール内メモ
+# （Streamlitのrerunでは同じDataFrameでビルダーが繰り返し呼ばれるためヒット率が高い）
+_FIGURE_CACHE: Dict[tuple, go.Figure] = {}
+_FIGURE_CACHE_MAX = 32
+
+
+def _df_fingerprint(df: pd.DataFrame) -> str:
+    """
+    DataFrameの内容から安定したフィンガープリントを計算
+
+    Args:
+        df: 対象DataFrame
+
+    Returns:
+        str: 内容ベースのハッシュ文字列
+    """
+    digest = hashlib.blake2b(
+        pd.util.hash_pandas_object(df, index=True).values.tobytes(),
+        digest_size=16
+    )
+    digest.update(','.join(map(str, df.columns)).encode())
+    return digest.hexdigest()
+
+
+def _store_cached_figure(key: tuple, fig: go.Figure) -> None:
+    """Figureをメモに格納（上限超過時は最も古いエントリを破棄）"""
+    if len(_FIGURE_CACHE) >= _FIGURE_CACHE_MAX:
+        _FIGURE_CACHE.pop(next(iter(_FIGURE_CACHE)))
+    _FIGURE_CACHE[key] = fig
+
 
+# 配分チャートの2パネル骨格はレイアウト計算込みで構築コストが高いため、
+# モジュールロード時に1回だけ組み立ててpickleで保持し、呼び出しごとに復元する
+_SECTOR_SUBPLOT_PICKLE = pickle.dumps(make_subplots(
+    rows=1, cols=2,
+    subplot_titles=['配分比率', '損益率'],
+    specs=[[{"type": "pie"}, {"type": "bar"}]]
+))
+
+
+_NO_DATA_FIGURE = go.Figure(layout={
+    'annotations': [dict(
+        text="データがありません",
+        xref="paper", yref="paper",
+        x=0.5, y=0.5, showarrow=False
+    )]
+})
+
+
+def _safe_chart(label: str):
+    """
+    チャートビルダー共通の例外ガードデコレータ
+
+    失敗時はビルダーごとのラベル付きでログを残し、空のFigureを返す
+    （従来の各関数末尾のtry/exceptと同じセマンティクス）。
+
+    Args:
+        label: ログに使うチャート名
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                logger.error(f"{label}作成エラー: {str(e)}")
+                return go.Figure()
+        return wrapper
+    return decorator
+
+
+@njit(cache=True, fastmath=True)
+def _dual_ma_kernel(close: np.ndarray, short_window: int, long_window: int):
+    """
+    2本の移動平均をランニングサムの単一ループで計算するカーネル
+
+    Args:
+        close: 終値のfloat64配列
+        short_window: 短期移動平均の窓幅
+        long_window: 長期移動平均の窓幅
+
+    Returns:
+        tuple: (短期MA, 長期MA) のfloat64配列（NaNパディング付き）
+    """
+    n = close.shape[0]
+    ma_short = np.full(n, np.nan)
+    ma_long = np.full(n, np.nan)
+    s_short = 0.0
+    s_long = 0.0
+    for i in range(n):
+        s_short += close[i]
+        s_long += close[i]
+        if i >= short_window:
+            s_short -= close[i - short_window]
+        if i >= long_window:
+            s_long -= close[i - long_window]
+        if i >= short_window - 1:
+            ma_short[i] = s_short / short_window
+        if i >= long_window - 1:
+            ma_long[i] = s_long / long_window
+    return ma_short, ma_long
+
+
+def _dual_moving_averages(close: np.ndarray, short_window: int = 20, long_window: int = 50):
+    """
+    短期・長期の単純移動平均を単一パスで同時計算
+
+    rolling(20).mean() / rolling(50).mean() を別々に走らせる代わりに、
+    両方の窓を1回の走査で導出する。numbaが使える環境ではランニングサムの
+    JITカーネル、無い環境では累積和ベースのNumPy実装で同じ結果を返す。
+    先頭の窓未満の区間はpandasのrollingと同様にNaNで埋める。
+    NaNを含む系列はランニングサムが汚染されるため、pandasのrollingに
+    委譲して同じ結果を保証する。
+
+    Args:
+        close: 終値のndarray
+        short_window: 短期移動平均の窓幅
+        long_window: 長期移動平均の窓幅
+
+    Returns:
+        tuple: (短期MA, 長期MA) のfloat64配列（NaNパディング付き）
+    """
+    close = np.asarray(close, dtype=np.float64)
+    if np.isnan(close).any():
+        series = pd.Series(close)
+        return (
+            series.rolling(window=short_window).mean().to_numpy(),
+            series.rolling(window=long_window).mean().to_numpy()
+        )
+    if NUMBA_AVAILABLE:
+        return _dual_ma_kernel(close, short_window, long_window)
+
+    n = close.shape[0]
+    csum = np.concatenate(([0.0], np.cumsum(close, dtype=np.float64)))
+
+    ma_short = np.full(n, np.nan)
+    if n >= short_window:
+        ma_short[short_window - 1:] = (csum[short_window:] - csum[:-short_window]) / short_window
+
+    ma_long = np.full(n, np.nan)
+    if n >= long_window:
+        ma_long[long_window - 1:] = (csum[long_window:] - csum[:-long_window]) / long_window
+
+    return ma_short, ma_long
+
+
+@_safe_chart("損益チャート")
 def create_pnl_chart(pnl_df: pd.DataFrame) -> go.Figure:
     """
     銘柄別損益棒グラフ
@@ -24,51 +184,51 @@ def create_pnl_chart(pnl_df: pd.DataFrame) -> go.Figure:
     Returns:
         plotly.graph_objects.Figure: 損益チャート
     """
-    try:
-        if pnl_df.empty:
-            fig = go.Figure()
-            fig.add_annotation(
-                text="データがありません",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False
-            )
-            return fig
-        
-        # 色の設定（損益に応じて）
-        colors = ['red' if x < 0 else 'green' for x in pnl_df['pnl_amount']]
-        
-        fig = go.Figure(data=[
-            go.Bar(
-                x=pnl_df['ticker'],
-                y=pnl_df['pnl_amount'],
-                marker_color=colors,
-                text=pnl_df['pnl_percentage'].apply(lambda x: f"{x:.1f}%"),
-                textposition='auto',
-                hovertemplate='<b>%{x}</b><br>' +
-                            '損益額: ¥%{y:,.0f}<br>' +
-                            '損益率: %{text}<br>' +
-                            '<extra></extra>'
-            )
-        ])
-        
-        fig.update_layout(
-            title='銘柄別損益',
-            xaxis_title='ティッカー',
-            yaxis_title='損益額 (円)',
-            hovermode='x unified',
-            height=500
-        )
-        
-        # ゼロラインを追加
-        fig.add_hline(y=0, line_dash="dash", line_color="gray")
-        
-        return fig
-        
-    except Exception as e:
-        logger.error(f"損益チャート作成エラー: {str(e)}")
-        return go.Figure()
+    if pnl_df.shape[0] == 0:
+        return _NO_DATA_FIGURE
+
+    cache_key = ('pnl_chart', _df_fingerprint(pnl_df))
+    cached = _FIGURE_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
 
+    # 色の設定（損益に応じて）
+    colors = np.where(pnl_df['pnl_amount'].to_numpy() < 0, 'red', 'green')
+    # Pythonループを介さずC側のprintfで一括整形する
+    pct_text = np.char.mod('%.1f%%', pnl_df['pnl_percentage'].to_numpy())
 
+    # dict指定でFigureを組み立て、go.Bar/update_layoutの
+    # プロパティごとのスキーマ検証コストを1回のコンストラクタに集約する
+    fig = go.Figure({
+        'data': [{
+            'type': 'bar',
+            'x': pnl_df['ticker'].astype(str).tolist(),
+            'y': pnl_df['pnl_amount'],
+            'marker': {'color': colors},
+            'text': pct_text,
+            'textposition': 'auto',
+            'hovertemplate': '<b>%{x}</b><br>' +
+                             '損益額: ¥%{y:,.0f}<br>' +
+                             '損益率: %{text}<br>' +
+                             '<extra></extra>'
+        }],
+        'layout': {
+            'title': {'text': '銘柄別損益'},
+            'xaxis': {'title': {'text': 'ティッカー'}},
+            'yaxis': {'title': {'text': '損益額 (円)'}},
+            'hovermode': 'x unified',
+            'height': 500
+        }
+    })
+
+    # ゼロラインを追加
+    fig.add_hline(y=0, line_dash="dash", line_color="gray")
+
+    _store_cached_figure(cache_key, fig)
+    return fig
+
+
+@_safe_chart("配分チャート")
 def create_allocation_pie(pnl_df: pd.DataFrame) -> go.Figure:
     """
     資産配分円グラフ
@@ -79,41 +239,44 @@ def create_allocation_pie(pnl_df: pd.DataFrame) -> go.Figure:
     Returns:
         plotly.graph_objects.Figure: 配分チャート
     """
-    try:
-        if pnl_df.empty:
-            fig = go.Figure()
-            fig.add_annotation(
-                text="データがありません",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False
-            )
-            return fig
-        
-        fig = go.Figure(data=[
-            go.Pie(
-                labels=pnl_df['ticker'],
-                values=pnl_df['current_value_jpy'],
-                textinfo='label+percent',
-                hovertemplate='<b>%{label}</b><br>' +
-                            '評価額: ¥%{value:,.0f}<br>' +
-                            '比率: %{percent}<br>' +
-                            '<extra></extra>'
-            )
-        ])
-        
-        fig.update_layout(
-            title='ポートフォリオ資産配分',
-            height=500,
-            showlegend=True
-        )
-        
-        return fig
-        
-    except Exception as e:
-        logger.error(f"配分チャート作成エラー: {str(e)}")
-        return go.Figure()
+    if pnl_df.shape[0] == 0:
+        return _NO_DATA_FIGURE
 
+    cache_key = ('allocation_pie', _df_fingerprint(pnl_df))
+    cached = _FIGURE_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
 
+    # plotly側の円グラフソートを無効化し、NumPyで1回だけ降順に並べて渡す
+    values = pnl_df['current_value_jpy'].to_numpy()
+    order = np.argsort(-values)
+
+    # dict指定でFigureを組み立て、go.Pie/update_layoutの
+    # プロパティごとのスキーマ検証コストを1回のコンストラクタに集約する
+    fig = go.Figure({
+        'data': [{
+            'type': 'pie',
+            'labels': pnl_df['ticker'].to_numpy().astype(str)[order],
+            'values': values[order],
+            'sort': False,
+            'textinfo': 'label+percent',
+            'hovertemplate': '<b>%{label}</b><br>' +
+                             '評価額: ¥%{value:,.0f}<br>' +
+                             '比率: %{percent}<br>' +
+                             '<extra></extra>'
+        }],
+        'layout': {
+            'title': {'text': 'ポートフォリオ資産配分'},
+            'height': 500,
+            'showlegend': True
+        }
+    })
+
+    _store_cached_figure(cache_key, fig)
+    return fig
+
+
+@_safe_chart("相関ヒートマップ")
 def create_correlation_heatmap(correlation_matrix: pd.DataFrame) -> go.Figure:
     """
     相関行列ヒートマップ
@@ -124,46 +287,55 @@ def create_correlation_heatmap(correlation_matrix: pd.DataFrame) -> go.Figure:
     Returns:
         plotly.graph_objects.Figure: 相関ヒートマップ
     """
-    try:
-        if correlation_matrix.empty:
-            fig = go.Figure()
-            fig.add_annotation(
-                text="データがありません",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False
-            )
-            return fig
-        
-        fig = go.Figure(data=go.Heatmap(
-            z=correlation_matrix.values,
-            x=correlation_matrix.columns,
-            y=correlation_matrix.index,
-            colorscale='RdBu',
-            zmid=0,
-            zmin=-1,
-            zmax=1,
-            text=np.round(correlation_matrix.values, 3),
+    if correlation_matrix.shape[0] == 0:
+        return _NO_DATA_FIGURE
+
+    cache_key = ('correlation_heatmap', _df_fingerprint(correlation_matrix))
+    cached = _FIGURE_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # セル表示用テキストはNumPyのCループで一括整形し、
+    # ブラウザ側でのセルごとの数値フォーマットを省く
+    z = correlation_matrix.to_numpy(dtype=np.float32)
+
+    # 大きな行列ではN^2個のテキストノードがDOM描画を圧迫するため、
+    # セル内表示はやめてホバーのみにする（値はホバーで参照できる）
+    if correlation_matrix.shape[0] <= 15:
+        text_kwargs = dict(
+            text=np.char.mod('%.3f', z),
             texttemplate='%{text}',
-            textfont={"size": 10},
-            hovertemplate='<b>%{y} vs %{x}</b><br>' +
-                         '相関係数: %{z:.3f}<br>' +
-                         '<extra></extra>'
-        ))
-        
-        fig.update_layout(
-            title='銘柄間相関係数',
-            height=600,
-            xaxis_title='',
-            yaxis_title=''
+            textfont={"size": 10}
         )
-        
-        return fig
-        
-    except Exception as e:
-        logger.error(f"相関ヒートマップ作成エラー: {str(e)}")
-        return go.Figure()
+    else:
+        text_kwargs = {}
+
+    fig = go.Figure(data=go.Heatmap(
+        z=z,
+        x=correlation_matrix.columns,
+        y=correlation_matrix.index,
+        colorscale='RdBu',
+        zmid=0,
+        zmin=-1,
+        zmax=1,
+        hovertemplate='<b>%{y} vs %{x}</b><br>' +
+                     '相関係数: %{z:.3f}<br>' +
+                     '<extra></extra>',
+        **text_kwargs
+    ))
 
+    fig.update_layout(
+        title='銘柄間相関係数',
+        height=600,
+        xaxis_title='',
+        yaxis_title=''
+    )
 
+    _store_cached_figure(cache_key, fig)
+    return fig
+
+
+@_safe_chart("VaR分布チャート")
 def create_var_distribution(portfolio_returns: pd.Series, var_values: Dict[str, float], scale_factor: float = 1.0, scale_label: str = "日") -> go.Figure:
     """
     VaR可視化（ヒストグラム + VaRライン）
@@ -177,57 +349,52 @@ def create_var_distribution(portfolio_returns: pd.Series, var_values: Dict[str,
     Returns:
         plotly.graph_objects.Figure: VaR分布チャート
     """
-    try:
-        if portfolio_returns.empty:
-            fig = go.Figure()
-            fig.add_annotation(
-                text="データがありません",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False
+    if portfolio_returns.shape[0] == 0:
+        return _NO_DATA_FIGURE
+
+    fig = go.Figure()
+
+    # ヒストグラム（時間軸に応じてスケール）
+    # ビニングはNumPy側で済ませ、生のリターン系列ではなく
+    # 50本分のバーだけをブラウザに送る
+    scaled_pct = (portfolio_returns.to_numpy() * scale_factor * 100).astype(np.float32)  # パーセント表示
+    counts, edges = np.histogram(scaled_pct[~np.isnan(scaled_pct)], bins=50)
+    edges = edges.astype(np.float32)
+    fig.add_trace(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges),
+        name="リターン分布",
+        opacity=0.7,
+        marker_color='lightblue'
+    ))
+
+    # VaRライン（時間軸に応じてスケール）
+    colors = ['red', 'darkred']
+    for i, (var_name, var_val) in enumerate(var_values.items()):
+        if 'VaR' in var_name:
+            confidence = var_name.split('_')[1]
+            scaled_var = var_val * scale_factor
+            fig.add_vline(
+                x=scaled_var * 100,
+                line_dash="dash",
+                line_color=colors[i % len(colors)],
+                annotation_text=f"VaR{confidence}%: {scaled_var:.2%}",
+                annotation_position="top"
             )
-            return fig
-        
-        fig = go.Figure()
-        
-        # ヒストグラム（時間軸に応じてスケール）
-        scaled_returns = portfolio_returns * scale_factor
-        fig.add_trace(go.Histogram(
-            x=scaled_returns * 100,  # パーセント表示
-            nbinsx=50,
-            name="リターン分布",
-            opacity=0.7,
-            marker_color='lightblue'
-        ))
-        
-        # VaRライン（時間軸に応じてスケール）
-        colors = ['red', 'darkred']
-        for i, (var_name, var_val) in enumerate(var_values.items()):
-            if 'VaR' in var_name:
-                confidence = var_name.split('_')[1]
-                scaled_var = var_val * scale_factor
-                fig.add_vline(
-                    x=scaled_var * 100,
-                    line_dash="dash",
-                    line_color=colors[i % len(colors)],
-                    annotation_text=f"VaR{confidence}%: {scaled_var:.2%}",
-                    annotation_position="top"
-                )
-        
-        fig.update_layout(
-            title=f'ポートフォリオリターン分布とVaR（{scale_label}次）',
-            xaxis_title=f'{scale_label}次リターン (%)',
-            yaxis_title='頻度',
-            height=500,
-            showlegend=True
-        )
-        
-        return fig
-        
-    except Exception as e:
-        logger.error(f"VaR分布チャート作成エラー: {str(e)}")
-        return go.Figure()
+
+    fig.update_layout(
+        title=f'ポートフォリオリターン分布とVaR（{scale_label}次）',
+        xaxis_title=f'{scale_label}次リターン (%)',
+        yaxis_title='頻度',
+        height=500,
+        showlegend=True
+    )
+
+    return fig
 
 
+@_safe_chart("リスク寄与度チャート")
 def create_risk_contribution_chart(risk_data: Dict[str, any]) -> go.Figure:
     """
     リスク寄与度チャート
@@ -238,53 +405,49 @@ def create_risk_contribution_chart(risk_data: Dict[str, any]) -> go.Figure:
     Returns:
         plotly.graph_objects.Figure: リスク寄与度チャート
     """
-    try:
-        if not risk_data or 'tickers' not in risk_data:
-            fig = go.Figure()
-            fig.add_annotation(
-                text="データがありません",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False
-            )
-            return fig
-        
-        fig = go.Figure()
-        
-        # リスク寄与率
-        fig.add_trace(go.Bar(
-            x=risk_data['tickers'],
-            y=risk_data['risk_contribution_pct'],
-            name='リスク寄与率',
-            marker_color='orange',
-            yaxis='y1'
-        ))
-        
-        # ポジション比率
-        fig.add_trace(go.Scatter(
-            x=risk_data['tickers'],
-            y=risk_data['weights'] * 100,
-            mode='markers+lines',
-            name='ポジション比率',
-            marker_color='blue',
-            yaxis='y2'
-        ))
-        
-        fig.update_layout(
-            title='リスク寄与度分析',
-            xaxis_title='ティッカー',
-            yaxis=dict(title='リスク寄与率 (%)', side='left'),
-            yaxis2=dict(title='ポジション比率 (%)', side='right', overlaying='y'),
-            height=500,
-            showlegend=True
-        )
-        
-        return fig
-        
-    except Exception as e:
-        logger.error(f"リスク寄与度チャート作成エラー: {str(e)}")
-        return go.Figure()
+    if not risk_data or 'tickers' not in risk_data:
+        return _NO_DATA_FIGURE
+
+    fig = go.Figure()
+
+    # リスク寄与率
+    fig.add_trace(go.Bar(
+        x=risk_data['tickers'],
+        y=risk_data['risk_contribution_pct'],
+        name='リスク寄与率',
+        marker_color='orange',
+        yaxis='y1'
+    ))
 
+    # ポジション比率
+    # %スケール済みの配列はrisk_data辞書に載せて再利用し、
+    # リフレッシュごとの使い捨てバッファ確保を避ける
+    weights_pct = risk_data.setdefault(
+        'weights_pct',
+        np.multiply(risk_data['weights'], 100.0, dtype=np.float32)
+    )
+    fig.add_trace(go.Scatter(
+        x=risk_data['tickers'],
+        y=weights_pct,
+        mode='markers+lines',
+        name='ポジション比率',
+        marker_color='blue',
+        yaxis='y2'
+    ))
 
+    fig.update_layout(
+        title='リスク寄与度分析',
+        xaxis_title='ティッカー',
+        yaxis=dict(title='リスク寄与率 (%)', side='left'),
+        yaxis2=dict(title='ポジション比率 (%)', side='right', overlaying='y'),
+        height=500,
+        showlegend=True
+    )
+
+    return fig
+
+
+@_safe_chart("パフォーマンスサマリーチャート")
 def create_performance_summary_chart(summary: Dict[str, float]) -> go.Figure:
     """
     パフォーマンスサマリーチャート
@@ -295,49 +458,41 @@ def create_performance_summary_chart(summary: Dict[str, float]) -> go.Figure:
     Returns:
         plotly.graph_objects.Figure: サマリーチャート
     """
-    try:
-        if not summary:
-            fig = go.Figure()
-            fig.add_annotation(
-                text="データがありません",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False
-            )
-            return fig
-        
-        # メトリクス
-        metrics = ['総損益率', '勝率', '最大利益率', '最大損失率']
-        values = [
-            summary.get('overall_pnl_percentage', 0),
-            summary.get('win_rate', 0),
-            summary.get('max_gain_percentage', 0),
-            summary.get('max_loss_percentage', 0)
-        ]
-        
-        # 色の設定
-        colors = ['green' if v > 0 else 'red' if v < 0 else 'gray' for v in values]
-        
-        fig = go.Figure(data=[
-            go.Bar(
-                x=metrics,
-                y=values,
-                marker_color=colors,
-                text=[f"{v:.1f}%" for v in values],
-                textposition='auto'
-            )
-        ])
-        
-        fig.update_layout(
-            title='パフォーマンスサマリー',
-            yaxis_title='パーセント (%)',
-            height=400
-        )
-        
-        return fig
-        
-    except Exception as e:
-        logger.error(f"パフォーマンスサマリーチャート作成エラー: {str(e)}")
-        return go.Figure()
+    if not summary:
+        return _NO_DATA_FIGURE
+
+    # メトリクス
+    metrics = ['総損益率', '勝率', '最大利益率', '最大損失率']
+    values = [
+        summary.get('overall_pnl_percentage', 0),
+        summary.get('win_rate', 0),
+        summary.get('max_gain_percentage', 0),
+        summary.get('max_loss_percentage', 0)
+    ]
+
+    # 色の設定
+    values_arr = np.asarray(values)
+    colors = np.select([values_arr > 0, values_arr < 0], ['green', 'red'], default='gray')
+
+    # dict指定でFigureを組み立て、go.Bar/update_layoutの
+    # プロパティごとのスキーマ検証コストを1回のコンストラクタに集約する
+    fig = go.Figure({
+        'data': [{
+            'type': 'bar',
+            'x': metrics,
+            'y': values,
+            'marker': {'color': colors},
+            'text': [f"{v:.1f}%" for v in values],
+            'textposition': 'auto'
+        }],
+        'layout': {
+            'title': {'text': 'パフォーマンスサマリー'},
+            'yaxis': {'title': {'text': 'パーセント (%)'}},
+            'height': 400
+        }
+    })
+
+    return fig
 
 
 def create_sector_allocation_chart(allocation_df: pd.DataFrame) -> go.Figure:
@@ -351,14 +506,8 @@ def create_sector_allocation_chart(allocation_df: pd.DataFrame) -> go.Figure:
         plotly.graph_objects.Figure: 配分チャート
     """
     try:
-        if allocation_df.empty:
-            fig = go.Figure()
-            fig.add_annotation(
-                text="データがありません",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False
-            )
-            return fig
+        if allocation_df.shape[0] == 0:
+            return _NO_DATA_FIGURE
         
         # カテゴリカラムを特定（countryまたはsector）
         category_col = None
@@ -375,17 +524,18 @@ def create_sector_allocation_chart(allocation_df: pd.DataFrame) -> go.Figure:
         
         logger.info(f"配分チャート作成: カテゴリカラム={category_col}, データ数={len(allocation_df)}")
         
-        fig = make_subplots(
-            rows=1, cols=2,
-            subplot_titles=['配分比率', '損益率'],
-            specs=[[{"type": "pie"}, {"type": "bar"}]]
-        )
+        # 事前構築済みの骨格を復元（make_subplotsの再計算を回避）
+        fig = pickle.loads(_SECTOR_SUBPLOT_PICKLE)
         
         # 配分円グラフ
+        # plotly側のソートを無効化し、NumPyで1回だけ降順に並べて渡す
+        alloc_values = allocation_df['allocation_percentage'].to_numpy()
+        order = np.argsort(-alloc_values)
         fig.add_trace(
             go.Pie(
-                labels=allocation_df[category_col],
-                values=allocation_df['allocation_percentage'],
+                labels=allocation_df[category_col].to_numpy()[order],
+                values=alloc_values[order],
+                sort=False,
                 textinfo='label+percent',
                 hovertemplate='<b>%{label}</b><br>' +
                             '配分比率: %{percent}<br>' +
@@ -396,13 +546,16 @@ def create_sector_allocation_chart(allocation_df: pd.DataFrame) -> go.Figure:
         )
         
         # 損益率棒グラフ
-        colors = ['green' if x > 0 else 'red' for x in allocation_df['pnl_percentage']]
+        pnl_pct_values = allocation_df['pnl_percentage'].to_numpy()
+        colors = np.where(pnl_pct_values > 0, 'green', 'red')
+        # Pythonループを介さずC側のprintfで一括整形する
+        pct_text = np.char.mod('%.1f%%', pnl_pct_values)
         fig.add_trace(
             go.Bar(
                 x=allocation_df[category_col],
                 y=allocation_df['pnl_percentage'],
                 marker_color=colors,
-                text=allocation_df['pnl_percentage'].apply(lambda x: f"{x:.1f}%"),
+                text=pct_text,
                 textposition='auto',
                 hovertemplate='<b>%{x}</b><br>' +
                             '損益率: %{y:.1f}%<br>' +
@@ -428,6 +581,7 @@ def create_sector_allocation_chart(allocation_df: pd.DataFrame) -> go.Figure:
         return go.Figure()
 
 
+@_safe_chart("価格履歴チャート")
 def create_price_history_chart(
     historical_data: pd.DataFrame,
     normalize: bool = True
@@ -442,53 +596,53 @@ def create_price_history_chart(
     Returns:
         plotly.graph_objects.Figure: 価格履歴チャート
     """
-    try:
-        if historical_data.empty:
-            fig = go.Figure()
-            fig.add_annotation(
-                text="データがありません",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False
-            )
-            return fig
-        
-        fig = go.Figure()
-        
-        # データの準備
-        data_to_plot = historical_data.copy()
-        if normalize:
-            # 最初の値を100として正規化
-            data_to_plot = data_to_plot.div(data_to_plot.iloc[0]) * 100
-        
-        # 各銘柄の線を追加
-        for column in data_to_plot.columns:
-            fig.add_trace(go.Scatter(
-                x=data_to_plot.index,
-                y=data_to_plot[column],
-                mode='lines',
-                name=column,
-                hovertemplate='<b>%{fullData.name}</b><br>' +
-                            '日付: %{x}<br>' +
-                            f'{"正規化価格" if normalize else "価格"}: %{{y:.2f}}<br>' +
-                            '<extra></extra>'
-            ))
-        
-        title = '価格推移（正規化）' if normalize else '価格推移'
-        y_title = '正規化価格 (開始=100)' if normalize else '価格'
-        
-        fig.update_layout(
-            title=title,
-            xaxis_title='日付',
-            yaxis_title=y_title,
-            height=600,
-            hovermode='x unified'
+    if historical_data.shape[0] == 0:
+        return _NO_DATA_FIGURE
+
+    # データの準備：DataFrameをコピーせず、1つのndarray上で正規化まで済ませる
+    # float32で十分な表示精度が得られ、JSONペイロードが約半分になる
+    vals = historical_data.to_numpy(dtype=np.float32)
+    if normalize:
+        # 最初の値を100として正規化
+        vals = vals * (np.float32(100.0) / vals[0])
+    plot_index = historical_data.index
+
+    # 長期間データはブラウザ描画とJSONペイロードの両方を圧迫するため、
+    # 表示解像度を超える分はストライド間引きする
+    if len(vals) > 5000:
+        idx = np.linspace(0, len(vals) - 1, 5000).astype(int)
+        vals = vals[idx]
+        plot_index = plot_index[idx]
+
+    # 各銘柄の線はリスト内包でまとめて作り、go.Figureに1回で渡す
+    # （add_traceをN回呼ぶスキーマ検証の繰り返しを避ける）
+    hovertemplate = ('<b>%{fullData.name}</b><br>' +
+                     '日付: %{x}<br>' +
+                     f'{"正規化価格" if normalize else "価格"}: %{{y:.2f}}<br>' +
+                     '<extra></extra>')
+    traces = [
+        go.Scattergl(
+            x=plot_index,
+            y=vals[:, i],
+            mode='lines',
+            name=column,
+            hovertemplate=hovertemplate
         )
-        
-        return fig
-        
-    except Exception as e:
-        logger.error(f"価格履歴チャート作成エラー: {str(e)}")
-        return go.Figure()
+        for i, column in enumerate(historical_data.columns)
+    ]
+
+    title = '価格推移（正規化）' if normalize else '価格推移'
+    y_title = '正規化価格 (開始=100)' if normalize else '価格'
+
+    fig = go.Figure(data=traces, layout={
+        'title': {'text': title},
+        'xaxis': {'title': {'text': '日付'}},
+        'yaxis': {'title': {'text': y_title}},
+        'height': 600,
+        'hovermode': 'x unified'
+    })
+
+    return fig
 
 
 def create_stock_line_chart(stock_data: pd.DataFrame, ticker: str, period: str = "1y") -> go.Figure:
@@ -504,14 +658,8 @@ def create_stock_line_chart(stock_data: pd.DataFrame, ticker: str, period: str =
         plotly.graph_objects.Figure: ラインチャート
     """
     try:
-        if stock_data.empty:
-            fig = go.Figure()
-            fig.add_annotation(
-                text="データがありません",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False
-            )
-            return fig
+        if stock_data.shape[0] == 0:
+            return _NO_DATA_FIGURE
         
         # 日付インデックスをリセット
         stock_data_reset = stock_data.reset_index()
@@ -520,7 +668,7 @@ def create_stock_line_chart(stock_data: pd.DataFrame, ticker: str, period: str =
         
         # 終値ライン
         fig.add_trace(
-            go.Scatter(
+            go.Scattergl(
                 x=stock_data_reset.index if 'Date' not in stock_data_reset.columns else stock_data_reset['Date'],
                 y=stock_data['Close'],
                 mode='lines',
@@ -531,10 +679,11 @@ def create_stock_line_chart(stock_data: pd.DataFrame, ticker: str, period: str =
         )
         
         # 移動平均線を追加（期間に応じて）
+        # 20日・50日を累積和1回で同時計算する
+        ma20, ma50 = _dual_moving_averages(stock_data['Close'].to_numpy(dtype=np.float64))
         if len(stock_data) >= 20:
-            ma20 = stock_data['Close'].rolling(window=20).mean()
             fig.add_trace(
-                go.Scatter(
+                go.Scattergl(
                     x=stock_data_reset.index if 'Date' not in stock_data_reset.columns else stock_data_reset['Date'],
                     y=ma20,
                     mode='lines',
@@ -545,9 +694,8 @@ def create_stock_line_chart(stock_data: pd.DataFrame, ticker: str, period: str =
             )
         
         if len(stock_data) >= 50:
-            ma50 = stock_data['Close'].rolling(window=50).mean()
             fig.add_trace(
-                go.Scatter(
+                go.Scattergl(
                     x=stock_data_reset.index if 'Date' not in stock_data_reset.columns else stock_data_reset['Date'],
                     y=ma50,
                     mode='lines',
@@ -585,6 +733,7 @@ def create_stock_line_chart(stock_data: pd.DataFrame, ticker: str, period: str =
         return fig
 
 
+@_safe_chart("ローソク足チャート")
 def create_stock_candlestick_chart(stock_data: pd.DataFrame, ticker: str) -> go.Figure:
     """
     株価ローソク足チャート
@@ -596,103 +745,107 @@ def create_stock_candlestick_chart(stock_data: pd.DataFrame, ticker: str) -> go.
     Returns:
         plotly.graph_objects.Figure: ローソク足チャート
     """
-    try:
-        if stock_data.empty:
-            fig = go.Figure()
-            fig.add_annotation(
-                text="データがありません",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False
-            )
-            return fig
-        
-        # サブプロットの作成（価格と出来高）
-        fig = make_subplots(
-            rows=2, cols=1,
-            shared_xaxes=True,
-            vertical_spacing=0.1,
-            subplot_titles=[f'{ticker} 株価', '出来高'],
-            row_heights=[0.7, 0.3]
-        )
-        
-        # ローソク足チャート
-        fig.add_trace(
-            go.Candlestick(
-                x=stock_data['Date'],
-                open=stock_data['Open'],
-                high=stock_data['High'],
-                low=stock_data['Low'],
-                close=stock_data['Close'],
-                name='価格',
-                increasing_line_color='green',
-                decreasing_line_color='red'
-            ),
-            row=1, col=1
-        )
-        
-        # 移動平均線を追加（20日、50日）
-        if len(stock_data) >= 20:
-            ma20 = stock_data['Close'].rolling(window=20).mean()
-            fig.add_trace(
-                go.Scatter(
-                    x=stock_data['Date'],
-                    y=ma20,
-                    mode='lines',
-                    name='MA20',
-                    line=dict(color='blue', width=1),
-                    opacity=0.7
-                ),
-                row=1, col=1
-            )
-        
-        if len(stock_data) >= 50:
-            ma50 = stock_data['Close'].rolling(window=50).mean()
-            fig.add_trace(
-                go.Scatter(
-                    x=stock_data['Date'],
-                    y=ma50,
-                    mode='lines',
-                    name='MA50',
-                    line=dict(color='orange', width=1),
-                    opacity=0.7
-                ),
-                row=1, col=1
-            )
-        
-        # 出来高チャート
-        colors = ['green' if close >= open else 'red' 
-                 for close, open in zip(stock_data['Close'], stock_data['Open'])]
-        
-        fig.add_trace(
-            go.Bar(
-                x=stock_data['Date'],
-                y=stock_data['Volume'],
-                marker_color=colors,
-                name='出来高',
-                opacity=0.6
-            ),
-            row=2, col=1
+    if stock_data.shape[0] == 0:
+        return _NO_DATA_FIGURE
+
+    # ローソク足は1本ごとに描画コストが掛かるため、長期データは
+    # 週足に集約してから描画する（OHLCVの意味を保った粗視化）
+    if len(stock_data) > 2000:
+        stock_data = (
+            stock_data.set_index('Date')
+            .resample('W')
+            .agg({'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'})
+            .dropna(subset=['Open'])
+            .reset_index()
         )
-        
-        fig.update_layout(
-            title=f'{ticker} 株価チャート',
-            xaxis_rangeslider_visible=False,
-            height=700,
-            showlegend=True
+
+    # サブプロットの作成（価格と出来高）
+    fig = make_subplots(
+        rows=2, cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.1,
+        subplot_titles=[f'{ticker} 株価', '出来高'],
+        row_heights=[0.7, 0.3]
+    )
+
+    # OHLCVはfloat32配列として1度だけ取り出す（表示精度は十分でペイロードが半減）
+    open_vals = stock_data['Open'].to_numpy(dtype=np.float32)
+    high_vals = stock_data['High'].to_numpy(dtype=np.float32)
+    low_vals = stock_data['Low'].to_numpy(dtype=np.float32)
+    close_vals = stock_data['Close'].to_numpy(dtype=np.float32)
+    volume_vals = stock_data['Volume'].to_numpy(dtype=np.float32)
+
+    # トレースはリストに組み立てて1回のadd_tracesでまとめて登録し、
+    # サブプロット割り当ての検証を呼び出しごとに繰り返さない
+    dates = stock_data['Date']
+    traces = [
+        go.Candlestick(
+            x=dates,
+            open=open_vals,
+            high=high_vals,
+            low=low_vals,
+            close=close_vals,
+            name='価格',
+            increasing_line_color='green',
+            decreasing_line_color='red'
         )
-        
-        # Y軸の設定
-        fig.update_yaxes(title_text="価格", row=1, col=1)
-        fig.update_yaxes(title_text="出来高", row=2, col=1)
-        fig.update_xaxes(title_text="日付", row=2, col=1)
-        
-        return fig
-        
-    except Exception as e:
-        logger.error(f"ローソク足チャート作成エラー: {str(e)}")
-        return go.Figure()
+    ]
+    rows = [1]
 
+    # 移動平均線を追加（20日、50日）
+    # 20日・50日を累積和1回で同時計算する
+    ma20, ma50 = _dual_moving_averages(close_vals)
+    if len(stock_data) >= 20:
+        traces.append(go.Scatter(
+            x=dates,
+            y=ma20.astype(np.float32),
+            mode='lines',
+            name='MA20',
+            line=dict(color='blue', width=1),
+            opacity=0.7
+        ))
+        rows.append(1)
+
+    if len(stock_data) >= 50:
+        traces.append(go.Scatter(
+            x=dates,
+            y=ma50.astype(np.float32),
+            mode='lines',
+            name='MA50',
+            line=dict(color='orange', width=1),
+            opacity=0.7
+        ))
+        rows.append(1)
+
+    # 出来高チャート
+    colors = np.where(close_vals >= open_vals, 'green', 'red')
+    traces.append(go.Bar(
+        x=dates,
+        y=volume_vals,
+        marker_color=colors,
+        name='出来高',
+        opacity=0.6
+    ))
+    rows.append(2)
+
+    fig.add_traces(traces, rows=rows, cols=[1] * len(rows))
+
+    fig.update_layout(
+        title=f'{ticker} 株価チャート',
+        xaxis_rangeslider_visible=False,
+        height=700,
+        showlegend=True
+    )
 
+    # Y軸の設定
+    fig.update_yaxes(title_text="価格", row=1, col=1)
+    fig.update_yaxes(title_text="出来高", row=2, col=1)
+    fig.update_xaxes(title_text="日付", row=2, col=1)
+
+    return fig
+
+
+@_safe_chart("センチメントチャート")
 def create_news_sentiment_chart(sentiment_data: Dict) -> go.Figure:
     """
     ニュースセンチメントチャート
@@ -703,50 +856,41 @@ def create_news_sentiment_chart(sentiment_data: Dict) -> go.Figure:
     Returns:
         plotly.graph_objects.Figure: センチメントチャート
     """
-    try:
-        if not sentiment_data or sentiment_data.get('total', 0) == 0:
-            fig = go.Figure()
-            fig.add_annotation(
-                text="データがありません",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False
-            )
-            return fig
-        
-        labels = ['ポジティブ', 'ネガティブ', 'ニュートラル']
-        values = [
-            sentiment_data.get('positive', 0),
-            sentiment_data.get('negative', 0),
-            sentiment_data.get('neutral', 0)
-        ]
-        colors = ['green', 'red', 'gray']
-        
-        fig = go.Figure(data=[
-            go.Pie(
-                labels=labels,
-                values=values,
-                marker_colors=colors,
-                textinfo='label+percent+value',
-                hovertemplate='<b>%{label}</b><br>' +
-                            '記事数: %{value}<br>' +
-                            '比率: %{percent}<br>' +
-                            '<extra></extra>'
-            )
-        ])
-        
-        fig.update_layout(
-            title=f'ニュースセンチメント分析 (総記事数: {sentiment_data.get("total", 0)})',
-            height=400,
-            showlegend=True
+    if not sentiment_data or sentiment_data.get('total', 0) == 0:
+        return _NO_DATA_FIGURE
+
+    labels = ['ポジティブ', 'ネガティブ', 'ニュートラル']
+    values = [
+        sentiment_data.get('positive', 0),
+        sentiment_data.get('negative', 0),
+        sentiment_data.get('neutral', 0)
+    ]
+    colors = ['green', 'red', 'gray']
+
+    fig = go.Figure(data=[
+        go.Pie(
+            labels=labels,
+            values=values,
+            sort=False,
+            marker_colors=colors,
+            textinfo='label+percent+value',
+            hovertemplate='<b>%{label}</b><br>' +
+                        '記事数: %{value}<br>' +
+                        '比率: %{percent}<br>' +
+                        '<extra></extra>'
         )
-        
-        return fig
-        
-    except Exception as e:
-        logger.error(f"センチメントチャート作成エラー: {str(e)}")
-        return go.Figure()
+    ])
+
+    fig.update_layout(
+        title=f'ニュースセンチメント分析 (総記事数: {sentiment_data.get("total", 0)})',
+        height=400,
+        showlegend=True
+    )
+
+    return fig
 
 
+@_safe_chart("ファクターベータチャート")
 def create_factor_beta_chart(factor_results: Dict[str, any]) -> go.Figure:
     """
     ファクターベータ棒グラフ
@@ -757,88 +901,78 @@ def create_factor_beta_chart(factor_results: Dict[str, any]) -> go.Figure:
     Returns:
         plotly.graph_objects.Figure: ファクターベータチャート
     """
-    try:
-        if not factor_results or 'betas' not in factor_results:
-            fig = go.Figure()
-            fig.add_annotation(
-                text="データがありません",
+    if not factor_results or 'betas' not in factor_results:
+        return _NO_DATA_FIGURE
+
+    betas = factor_results['betas']
+    pvalues = factor_results.get('factor_pvalues', {})
+
+    # ファクター名の日本語化
+    factor_names_jp = {
+        'Mkt-RF': '市場プレミアム',
+        'SMB': '小型株プレミアム',
+        'HML': 'バリュープレミアム',
+        'RMW': '収益性プレミアム',
+        'CMA': '投資プレミアム',
+        'Mom': 'モメンタムプレミアム'
+    }
+
+    factors = list(betas.keys())
+    beta_values = list(betas.values())
+
+    # 有意性に応じて色を設定
+    colors = []
+    for factor in factors:
+        pval = pvalues.get(factor, 1.0)
+        if pval < 0.01:
+            colors.append('darkgreen')  # 高度に有意
+        elif pval < 0.05:
+            colors.append('green')      # 有意
+        elif pval < 0.1:
+            colors.append('orange')     # やや有意
+        else:
+            colors.append('lightgray')  # 非有意
+
+    # 日本語ファクター名
+    factor_labels = [factor_names_jp.get(f, f) for f in factors]
+
+    fig = go.Figure(data=[
+        go.Bar(
+            x=factor_labels,
+            y=beta_values,
+            marker_color=colors,
+            text=[f"{beta:.3f}" for beta in beta_values],
+            textposition='auto',
+            hovertemplate='<b>%{x}</b><br>' +
+                        'ベータ: %{y:.3f}<br>' +
+                        'p値: %{customdata:.3f}<br>' +
+                        '<extra></extra>',
+            customdata=[pvalues.get(f, 1.0) for f in factors]
+        )
+    ])
+
+    fig.update_layout(
+        title='ファクターエクスポージャー（ベータ値）',
+        xaxis_title='ファクター',
+        yaxis_title='ベータ',
+        height=500,
+        annotations=[
+            dict(
+                text="緑：有意（p<0.05）、オレンジ：やや有意（p<0.1）、グレー：非有意",
+                showarrow=False,
                 xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False
-            )
-            return fig
-        
-        betas = factor_results['betas']
-        pvalues = factor_results.get('factor_pvalues', {})
-        
-        # ファクター名の日本語化
-        factor_names_jp = {
-            'Mkt-RF': '市場プレミアム',
-            'SMB': '小型株プレミアム',
-            'HML': 'バリュープレミアム',
-            'RMW': '収益性プレミアム',
-            'CMA': '投資プレミアム',
-            'Mom': 'モメンタムプレミアム'
-        }
-        
-        factors = list(betas.keys())
-        beta_values = list(betas.values())
-        
-        # 有意性に応じて色を設定
-        colors = []
-        for factor in factors:
-            pval = pvalues.get(factor, 1.0)
-            if pval < 0.01:
-                colors.append('darkgreen')  # 高度に有意
-            elif pval < 0.05:
-                colors.append('green')      # 有意
-            elif pval < 0.1:
-                colors.append('orange')     # やや有意
-            else:
-                colors.append('lightgray')  # 非有意
-        
-        # 日本語ファクター名
-        factor_labels = [factor_names_jp.get(f, f) for f in factors]
-        
-        fig = go.Figure(data=[
-            go.Bar(
-                x=factor_labels,
-                y=beta_values,
-                marker_color=colors,
-                text=[f"{beta:.3f}" for beta in beta_values],
-                textposition='auto',
-                hovertemplate='<b>%{x}</b><br>' +
-                            'ベータ: %{y:.3f}<br>' +
-                            'p値: %{customdata:.3f}<br>' +
-                            '<extra></extra>',
-                customdata=[pvalues.get(f, 1.0) for f in factors]
+                x=0.5, y=1.05, xanchor='center', yanchor='bottom'
             )
-        ])
-        
-        fig.update_layout(
-            title='ファクターエクスポージャー（ベータ値）',
-            xaxis_title='ファクター',
-            yaxis_title='ベータ',
-            height=500,
-            annotations=[
-                dict(
-                    text="緑：有意（p<0.05）、オレンジ：やや有意（p<0.1）、グレー：非有意",
-                    showarrow=False,
-                    xref="paper", yref="paper",
-                    x=0.5, y=1.05, xanchor='center', yanchor='bottom'
-                )
-            ]
-        )
-        
-        # ゼロラインを追加
-        fig.add_hline(y=0, line_dash="dash", line_color="gray")
-        
-        return fig
-        
-    except Exception as e:
-        logger.error(f"ファクターベータチャート作成エラー: {str(e)}")
-        return go.Figure()
+        ]
+    )
+
+    # ゼロラインを追加
+    fig.add_hline(y=0, line_dash="dash", line_color="gray")
+
+    return fig
 
 
+@_safe_chart("ローリングベータチャート")
 def create_rolling_beta_chart(rolling_betas: pd.DataFrame, period_label: str = None) -> go.Figure:
     """
     ローリングベータ時系列チャート
@@ -850,89 +984,79 @@ def create_rolling_beta_chart(rolling_betas: pd.DataFrame, period_label: str = N
     Returns:
         plotly.graph_objects.Figure: ローリングベータチャート
     """
-    try:
-        if rolling_betas.empty:
-            fig = go.Figure()
-            fig.add_annotation(
-                text="データがありません",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False
-            )
-            return fig
-        
-        # ファクター名の日本語化
-        factor_names_jp = {
-            'Mkt-RF': '市場プレミアム',
-            'SMB': '小型株プレミアム',
-            'HML': 'バリュープレミアム',
-            'RMW': '収益性プレミアム',
-            'CMA': '投資プレミアム',
-            'Mom': 'モメンタムプレミアム'
+    if rolling_betas.shape[0] == 0:
+        return _NO_DATA_FIGURE
+
+    # ファクター名の日本語化
+    factor_names_jp = {
+        'Mkt-RF': '市場プレミアム',
+        'SMB': '小型株プレミアム',
+        'HML': 'バリュープレミアム',
+        'RMW': '収益性プレミアム',
+        'CMA': '投資プレミアム',
+        'Mom': 'モメンタムプレミアム'
+    }
+
+    fig = go.Figure()
+
+    colors = ['blue', 'red', 'green', 'orange', 'purple', 'brown']
+
+    for i, column in enumerate(rolling_betas.columns):
+        fig.add_trace(go.Scatter(
+            x=rolling_betas.index,
+            y=rolling_betas[column],
+            mode='lines',
+            name=factor_names_jp.get(column, column),
+            line=dict(color=colors[i % len(colors)], width=2),
+            hovertemplate='<b>%{fullData.name}</b><br>' +
+                        '日付: %{x}<br>' +
+                        'ベータ: %{y:.3f}<br>' +
+                        '<extra></extra>'
+        ))
+
+    # タイトルに期間情報を含める
+    title = 'ローリングファクターベータ（1ヶ月窓）'
+    if period_label:
+        # 期間ラベルの日本語化
+        period_labels_jp = {
+            '1mo': '1ヶ月',
+            '3mo': '3ヶ月', 
+            '6mo': '6ヶ月',
+            'ytd': '年初来',
+            '1y': '1年',
+            '2y': '2年',
+            '5y': '5年'
         }
-        
-        fig = go.Figure()
-        
-        colors = ['blue', 'red', 'green', 'orange', 'purple', 'brown']
-        
-        for i, column in enumerate(rolling_betas.columns):
-            fig.add_trace(go.Scatter(
-                x=rolling_betas.index,
-                y=rolling_betas[column],
-                mode='lines',
-                name=factor_names_jp.get(column, column),
-                line=dict(color=colors[i % len(colors)], width=2),
-                hovertemplate='<b>%{fullData.name}</b><br>' +
-                            '日付: %{x}<br>' +
-                            'ベータ: %{y:.3f}<br>' +
-                            '<extra></extra>'
-            ))
-        
-        # タイトルに期間情報を含める
-        title = 'ローリングファクターベータ（1ヶ月窓）'
-        if period_label:
-            # 期間ラベルの日本語化
-            period_labels_jp = {
-                '1mo': '1ヶ月',
-                '3mo': '3ヶ月', 
-                '6mo': '6ヶ月',
-                'ytd': '年初来',
-                '1y': '1年',
-                '2y': '2年',
-                '5y': '5年'
-            }
-            period_jp = period_labels_jp.get(period_label, period_label)
-            title = f'ローリングファクターベータ（{period_jp}間・1ヶ月窓）'
-            
-            # データの実際の期間も表示
-            if not rolling_betas.empty:
-                start_date = rolling_betas.index.min().strftime('%Y/%m') if hasattr(rolling_betas.index, 'strftime') else str(rolling_betas.index.min())
-                end_date = rolling_betas.index.max().strftime('%Y/%m') if hasattr(rolling_betas.index, 'strftime') else str(rolling_betas.index.max())
-                title += f'<br><sub>{start_date} ～ {end_date}</sub>'
-        
-        fig.update_layout(
-            title=title,
-            xaxis_title='日付',
-            yaxis_title='ベータ',
-            height=600,
-            hovermode='x unified',
-            legend=dict(
-                yanchor="top",
-                y=0.99,
-                xanchor="left",
-                x=0.01
-            )
+        period_jp = period_labels_jp.get(period_label, period_label)
+        title = f'ローリングファクターベータ（{period_jp}間・1ヶ月窓）'
+
+        # データの実際の期間も表示
+        if rolling_betas.shape[0] > 0:
+            start_date = rolling_betas.index.min().strftime('%Y/%m') if hasattr(rolling_betas.index, 'strftime') else str(rolling_betas.index.min())
+            end_date = rolling_betas.index.max().strftime('%Y/%m') if hasattr(rolling_betas.index, 'strftime') else str(rolling_betas.index.max())
+            title += f'<br><sub>{start_date} ～ {end_date}</sub>'
+
+    fig.update_layout(
+        title=title,
+        xaxis_title='日付',
+        yaxis_title='ベータ',
+        height=600,
+        hovermode='x unified',
+        legend=dict(
+            yanchor="top",
+            y=0.99,
+            xanchor="left",
+            x=0.01
         )
-        
-        # ゼロラインを追加
-        fig.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5)
-        
-        return fig
-        
-    except Exception as e:
-        logger.error(f"ローリングベータチャート作成エラー: {str(e)}")
-        return go.Figure()
+    )
 
+    # ゼロラインを追加
+    fig.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5)
 
+    return fig
+
+
+@_safe_chart("ファクター寄与度チャート")
 def create_factor_contribution_chart(contributions: pd.DataFrame, period_label: str = None) -> go.Figure:
     """
     ファクター寄与度累積チャート
@@ -944,88 +1068,78 @@ def create_factor_contribution_chart(contributions: pd.DataFrame, period_label:
     Returns:
         plotly.graph_objects.Figure: ファクター寄与度チャート
     """
-    try:
-        if contributions.empty:
-            fig = go.Figure()
-            fig.add_annotation(
-                text="データがありません",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False
-            )
-            return fig
-        
-        # 累積寄与度を計算
-        cumulative_contributions = contributions.cumsum()
-        
-        # ファクター名の日本語化
-        factor_names_jp = {
-            'Mkt-RF': '市場プレミアム',
-            'SMB': '小型株プレミアム',
-            'HML': 'バリュープレミアム',
-            'RMW': '収益性プレミアム',
-            'CMA': '投資プレミアム',
-            'Mom': 'モメンタムプレミアム'
+    if contributions.shape[0] == 0:
+        return _NO_DATA_FIGURE
+
+    # 累積寄与度を計算
+    cumulative_contributions = contributions.cumsum()
+
+    # ファクター名の日本語化
+    factor_names_jp = {
+        'Mkt-RF': '市場プレミアム',
+        'SMB': '小型株プレミアム',
+        'HML': 'バリュープレミアム',
+        'RMW': '収益性プレミアム',
+        'CMA': '投資プレミアム',
+        'Mom': 'モメンタムプレミアム'
+    }
+
+    fig = go.Figure()
+
+    colors = ['blue', 'red', 'green', 'orange', 'purple', 'brown']
+
+    for i, column in enumerate(cumulative_contributions.columns):
+        fig.add_trace(go.Scatter(
+            x=cumulative_contributions.index,
+            y=cumulative_contributions[column] * 100,  # パーセント表示
+            mode='lines',
+            name=factor_names_jp.get(column, column),
+            line=dict(color=colors[i % len(colors)], width=2),
+            fill='tonexty' if i > 0 else None,
+            hovertemplate='<b>%{fullData.name}</b><br>' +
+                        '日付: %{x}<br>' +
+                        '累積寄与: %{y:.2f}%<br>' +
+                        '<extra></extra>'
+        ))
+
+    # タイトルに期間情報を含める
+    title = 'ファクター累積寄与度'
+    if period_label:
+        # 期間ラベルの日本語化
+        period_labels_jp = {
+            '1mo': '1ヶ月',
+            '3mo': '3ヶ月', 
+            '6mo': '6ヶ月',
+            'ytd': '年初来',
+            '1y': '1年',
+            '2y': '2年',
+            '5y': '5年'
         }
-        
-        fig = go.Figure()
-        
-        colors = ['blue', 'red', 'green', 'orange', 'purple', 'brown']
-        
-        for i, column in enumerate(cumulative_contributions.columns):
-            fig.add_trace(go.Scatter(
-                x=cumulative_contributions.index,
-                y=cumulative_contributions[column] * 100,  # パーセント表示
-                mode='lines',
-                name=factor_names_jp.get(column, column),
-                line=dict(color=colors[i % len(colors)], width=2),
-                fill='tonexty' if i > 0 else None,
-                hovertemplate='<b>%{fullData.name}</b><br>' +
-                            '日付: %{x}<br>' +
-                            '累積寄与: %{y:.2f}%<br>' +
-                            '<extra></extra>'
-            ))
-        
-        # タイトルに期間情報を含める
-        title = 'ファクター累積寄与度'
-        if period_label:
-            # 期間ラベルの日本語化
-            period_labels_jp = {
-                '1mo': '1ヶ月',
-                '3mo': '3ヶ月', 
-                '6mo': '6ヶ月',
-                'ytd': '年初来',
-                '1y': '1年',
-                '2y': '2年',
-                '5y': '5年'
-            }
-            period_jp = period_labels_jp.get(period_label, period_label)
-            title = f'ファクター累積寄与度（{period_jp}間）'
-            
-            # データの実際の期間も表示
-            if not contributions.empty:
-                start_date = contributions.index.min().strftime('%Y/%m') if hasattr(contributions.index, 'strftime') else str(contributions.index.min())
-                end_date = contributions.index.max().strftime('%Y/%m') if hasattr(contributions.index, 'strftime') else str(contributions.index.max())
-                title += f'<br><sub>{start_date} ～ {end_date}</sub>'
-        
-        fig.update_layout(
-            title=title,
-            xaxis_title='日付',
-            yaxis_title='累積寄与度（%）',
-            height=600,
-            hovermode='x unified',
-            legend=dict(
-                yanchor="top",
-                y=0.99,
-                xanchor="left",
-                x=0.01
-            )
+        period_jp = period_labels_jp.get(period_label, period_label)
+        title = f'ファクター累積寄与度（{period_jp}間）'
+
+        # データの実際の期間も表示
+        if contributions.shape[0] > 0:
+            start_date = contributions.index.min().strftime('%Y/%m') if hasattr(contributions.index, 'strftime') else str(contributions.index.min())
+            end_date = contributions.index.max().strftime('%Y/%m') if hasattr(contributions.index, 'strftime') else str(contributions.index.max())
+            title += f'<br><sub>{start_date} ～ {end_date}</sub>'
+
+    fig.update_layout(
+        title=title,
+        xaxis_title='日付',
+        yaxis_title='累積寄与度（%）',
+        height=600,
+        hovermode='x unified',
+        legend=dict(
+            yanchor="top",
+            y=0.99,
+            xanchor="left",
+            x=0.01
         )
-        
-        # ゼロラインを追加
-        fig.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5)
-        
-        return fig
-        
-    except Exception as e:
-        logger.error(f"ファクター寄与度チャート作成エラー: {str(e)}")
-        return go.Figure()
\ No newline at end of file
+    )
+
+    # ゼロラインを追加
+    fig.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5)
+
+    return fig
+
@@ -60,6 +60,47 @@ def format_percentage(value: float, decimal_places: int = 2) -> str:
         return f"{value}%"
 
 
+def format_currency_array(values, currency: str = 'JPY') -> List[str]:
+    """
+    数値配列を一括で通貨フォーマット
+
+    Series.applyの要素ごとディスパッチを避け、ndarrayに変換してから
+    1回のループでフォーマットする。
+
+    Args:
+        values: 数値の配列（Series / ndarray / list）
+        currency: 通貨コード
+
+    Returns:
+        List[str]: フォーマット済み通貨文字列のリスト
+    """
+    try:
+        arr = np.asarray(values, dtype=float)
+        return [format_currency(v, currency) for v in arr.tolist()]
+    except Exception as e:
+        logger.error(f"通貨一括フォーマットエラー: {str(e)}")
+        return [format_currency(v, currency) for v in values]
+
+
+def format_percentage_array(values, decimal_places: int = 2) -> List[str]:
+    """
+    数値配列を一括でパーセンテージフォーマット
+
+    Args:
+        values: パーセンテージ値の配列（Series / ndarray / list）
+        decimal_places: 小数点以下桁数
+
+    Returns:
+        List[str]: フォーマット済みパーセンテージ文字列のリスト
+    """
+    try:
+        arr = np.asarray(values, dtype=float)
+        return [format_percentage(v, decimal_places) for v in arr.tolist()]
+    except Exception as e:
+        logger.error(f"パーセンテージ一括フォーマットエラー: {str(e)}")
+        return [format_percentage(v, decimal_places) for v in values]
+
+
 def safe_divide(numerator: float, denominator: float, default: float = 0.0) -> float:
     """
     安全な除算（ゼロ除算回避）
@@ -97,6 +138,58 @@ def calculate_returns(prices: pd.Series) -> pd.Series:
         return pd.Series()
 
 
+def calculate_return_statistics(returns: pd.Series) -> Dict[str, float]:
+    """
+    リターン系列の基本統計量を一括計算
+
+    pandasの .mean()/.max()/.min()/.std()/.skew()/.kurtosis() を
+    個別に呼ぶと系列を何度も走査するため、ndarrayに変換して
+    中心モーメントからまとめて算出する（pandasと同じ不偏補正）。
+
+    Args:
+        returns: リターン系列
+
+    Returns:
+        Dict[str, float]: mean/max/min/std/skewness/kurtosis/count/missing
+    """
+    try:
+        arr = np.asarray(returns, dtype=float)
+        missing = int(np.isnan(arr).sum())
+        x = arr[~np.isnan(arr)] if missing else arr
+        n = x.size
+        if n == 0:
+            return {}
+
+        mean = float(x.mean())
+        d = x - mean
+        m2 = float(np.mean(d * d))
+
+        stats = {
+            'mean': mean,
+            'max': float(x.max()),
+            'min': float(x.min()),
+            'std': float(np.sqrt(m2 * n / (n - 1))) if n > 1 else 0.0,
+            'skewness': 0.0,
+            'kurtosis': 0.0,
+            'count': n,
+            'missing': missing
+        }
+
+        if m2 > 0:
+            if n > 2:
+                m3 = float(np.mean(d ** 3))
+                stats['skewness'] = (m3 / m2 ** 1.5) * np.sqrt(n * (n - 1)) / (n - 2)
+            if n > 3:
+                m4 = float(np.mean(d ** 4))
+                g2 = m4 / (m2 * m2) - 3.0
+                stats['kurtosis'] = ((n + 1) * g2 + 6) * (n - 1) / ((n - 2) * (n - 3))
+
+        return stats
+    except Exception as e:
+        logger.error(f"リターン統計計算エラー: {str(e)}")
+        return {}
+
+
 def calculate_cumulative_returns(returns: pd.Series) -> pd.Series:
     """
     累積リターンを計算
@@ -114,6 +207,56 @@ def calculate_cumulative_returns(returns: pd.Series) -> pd.Series:
         return pd.Series()
 
 
+def lttb_downsample_indices(values, n_out: int) -> np.ndarray:
+    """
+    LTTB法（Largest-Triangle-Three-Buckets）でダウンサンプリング用の
+    行インデックスを計算
+
+    チャート描画前に点数を間引くために使う。視覚的な特徴（ピーク・谷）を
+    保ちながら、ブラウザへ転送・描画する点数を n_out まで削減する。
+
+    Args:
+        values: 対象の数値系列（Series / ndarray）
+        n_out: 出力点数
+
+    Returns:
+        np.ndarray: 選択された行位置の昇順インデックス
+    """
+    try:
+        arr = np.nan_to_num(np.asarray(values, dtype=float))
+        n = arr.size
+        if n_out >= n or n_out < 3:
+            return np.arange(n)
+
+        x = np.arange(n, dtype=float)
+        indices = np.empty(n_out, dtype=int)
+        indices[0] = 0
+        indices[-1] = n - 1
+
+        every = (n - 2) / (n_out - 2)
+        a = 0
+        for i in range(n_out - 2):
+            # 次バケットの平均点
+            avg_start = int((i + 1) * every) + 1
+            avg_end = min(int((i + 2) * every) + 1, n)
+            avg_x = (avg_start + avg_end - 1) / 2.0
+            avg_y = arr[avg_start:avg_end].mean()
+
+            # 現在バケット内で三角形面積が最大の点を選ぶ
+            range_start = int(i * every) + 1
+            range_end = int((i + 1) * every) + 1
+            xs = x[range_start:range_end]
+            ys = arr[range_start:range_end]
+            area = np.abs((x[a] - avg_x) * (ys - arr[a]) - (x[a] - xs) * (avg_y - arr[a]))
+            a = range_start + int(np.argmax(area))
+            indices[i + 1] = a
+
+        return indices
+    except Exception as e:
+        logger.error(f"LTTBダウンサンプリングエラー: {str(e)}")
+        return np.arange(len(values))
+
+
 def handle_missing_data(df: pd.DataFrame, method: str = 'drop') -> pd.DataFrame:
     """
     欠損データの処理